@@ -0,0 +1,51 @@
+"""
+Helpers for reading settings from the environment.
+
+Project settings are named TODOS_<NAME> and can be set with the TODO_<NAME>
+environment variable, e.g. TODO_USER_CACHE_TTL sets TODOS_USER_CACHE_TTL.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+
+def env_choice(name, choices, default):
+    """Read the environment variable ``name``, which must be one of ``choices``."""
+    value = os.environ.get(name, default)
+    if value not in choices:
+        raise ImproperlyConfigured(f"{name}={value!r} is not valid; choose one of: {', '.join(choices)}")
+    return value
+
+
+CACHE_URL_BACKENDS = {
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'rediss': 'django.core.cache.backends.redis.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+}
+
+
+def cache_from_url(name, url):
+    """Build a CACHES entry from a redis://, rediss:// or memcached:// ``url``."""
+    scheme, _, address = url.partition('://')
+    if scheme not in CACHE_URL_BACKENDS:
+        raise ImproperlyConfigured(f"{name}={url!r} is not valid; use one of: {', '.join(CACHE_URL_BACKENDS)}")
+    # RedisCache takes the whole URL, PyMemcacheCache a host:port address.
+    location = address if scheme == 'memcached' else url
+    return {'BACKEND': CACHE_URL_BACKENDS[scheme], 'LOCATION': location}
+
+
+# Cache backends whose entries live in one process and are invisible to others.
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def require_shared_cache(caches, alias):
+    """Raise ImproperlyConfigured unless the cache ``alias`` is shared by every process."""
+    backend = caches.get(alias, {}).get('BACKEND')
+    if backend is None or backend in PROCESS_LOCAL_CACHES:
+        raise ImproperlyConfigured(
+            f"Cache {alias!r} ({backend}) is not shared between processes; "
+            f"point it at Redis or Memcached, e.g. with TODO_SESSION_CACHE_URL"
+        )
@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from todo_project.env import cache_from_url, env_choice, require_shared_cache
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -41,18 +44,17 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'todos.access_log.AccessLogMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'todos.middleware.CachedUserAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'todo_project.urls'
-
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -69,6 +71,32 @@ TEMPLATES = [
     },
 ]
 
+# Worker roles
+# TODO_ROLE trims the app stack for dedicated workers: 'all' (default) serves
+# everything, 'web' the HTML pages without the admin, 'api' only the JSON
+# endpoints and 'admin' only the admin site.
+ROLE_URLCONFS = {
+    'all': 'todo_project.urls',
+    'web': 'todo_project.urls',
+    'api': 'todo_project.urls_api',
+    'admin': 'todo_project.urls_admin',
+}
+TODOS_ROLE = env_choice('TODO_ROLE', ROLE_URLCONFS, 'all')
+ROOT_URLCONF = ROLE_URLCONFS[TODOS_ROLE]
+
+if TODOS_ROLE in ('web', 'api'):
+    INSTALLED_APPS.remove('django.contrib.admin')
+
+if TODOS_ROLE == 'api':
+    # JSON only: no flash messages, static files or frame-busting headers.
+    INSTALLED_APPS.remove('django.contrib.messages')
+    INSTALLED_APPS.remove('django.contrib.staticfiles')
+    MIDDLEWARE.remove('django.contrib.messages.middleware.MessageMiddleware')
+    MIDDLEWARE.remove('django.middleware.clickjacking.XFrameOptionsMiddleware')
+    TEMPLATES[0]['OPTIONS']['context_processors'].remove(
+        'django.contrib.messages.context_processors.messages'
+    )
+
 WSGI_APPLICATION = 'todo_project.wsgi.application'
 
 
@@ -83,6 +111,79 @@ DATABASES = {
 }
 
 
+# Caches
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
+# Sessions
+# https://docs.djangoproject.com/en/4.2/topics/http/sessions/
+
+# Pick the session store with TODO_SESSION_PROFILE: 'db' (one query per
+# request), 'cached_db' (reads served from the SESSION_CACHE_ALIAS cache) or
+# 'signed_cookies' (no server-side storage at all). cached_db needs a cache
+# every process shares, otherwise a session flushed by one worker stays
+# valid in the others; set TODO_SESSION_CACHE_URL to a redis:// or
+# memcached:// address for it.
+SESSION_CACHE_ALIAS = 'default'
+TODOS_SESSION_CACHE_URL = os.environ.get('TODO_SESSION_CACHE_URL')
+if TODOS_SESSION_CACHE_URL:
+    CACHES['sessions'] = cache_from_url('TODO_SESSION_CACHE_URL', TODOS_SESSION_CACHE_URL)
+    SESSION_CACHE_ALIAS = 'sessions'
+
+SESSION_PROFILES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+TODOS_SESSION_PROFILE = env_choice('TODO_SESSION_PROFILE', SESSION_PROFILES, 'db')
+SESSION_ENGINE = SESSION_PROFILES[TODOS_SESSION_PROFILE]
+if TODOS_SESSION_PROFILE == 'cached_db':
+    require_shared_cache(CACHES, SESSION_CACHE_ALIAS)
+
+# Seconds an authenticated user is kept in the per-process cache used by
+# CachedUserAuthenticationMiddleware; 0 loads it from the database every request.
+TODOS_USER_CACHE_TTL = int(os.environ.get('TODO_USER_CACHE_TTL', 30))
+
+# Per-user token bucket for the calendar API, per worker process: refilled at
+# TODO_CALENDAR_API_RATE requests per second, holding up to TODO_CALENDAR_API_BURST.
+# Either set to 0 disables the limit.
+TODOS_CALENDAR_API_RATE = float(os.environ.get('TODO_CALENDAR_API_RATE', 2))
+TODOS_CALENDAR_API_BURST = int(os.environ.get('TODO_CALENDAR_API_BURST', 20))
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/4.2/topics/auth/passwords/
+
+# TODO_PASSWORD_HASHER picks the hasher for new passwords: 'pbkdf2', 'scrypt'
+# or 'argon2' (needs argon2-cffi). The others stay listed so existing hashes
+# keep verifying and are upgraded on the next login.
+PASSWORD_HASHER_PROFILES = {
+    'pbkdf2': 'todos.hashers.TunedPBKDF2PasswordHasher',
+    'scrypt': 'todos.hashers.TunedScryptPasswordHasher',
+    'argon2': 'todos.hashers.TunedArgon2PasswordHasher',
+}
+TODOS_PASSWORD_HASHER = env_choice('TODO_PASSWORD_HASHER', PASSWORD_HASHER_PROFILES, 'pbkdf2')
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_PROFILES[TODOS_PASSWORD_HASHER],
+    *[path for name, path in PASSWORD_HASHER_PROFILES.items() if name != TODOS_PASSWORD_HASHER],
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+# Cost parameters per hasher; measure with `python manage.py bench_login`.
+TODOS_PASSWORD_HASHER_PARAMS = {
+    'pbkdf2': {'iterations': 600000},
+    'scrypt': {'work_factor': 2 ** 14, 'block_size': 8, 'parallelism': 1},
+    'argon2': {'time_cost': 2, 'memory_cost': 102400, 'parallelism': 8},
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -125,6 +226,10 @@ USE_I18N = True
 
 USE_TZ = True
 
+# Load every catalog in LANGUAGES at startup (see TodosConfig.ready) so the
+# first request in each language doesn't pay for reading the .mo files.
+TODOS_PRELOAD_TRANSLATIONS = True
+
 
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
@@ -139,7 +244,54 @@ STATICFILES_DIRS = [
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Background jobs (python manage.py run_jobs)
+# Completed TODOs untouched for this many days are moved to ArchivedTodo by
+# the archive_completed_todos job. purge_archived_todos deletes archived rows
+# older than TODOS_PURGE_ARCHIVED_AFTER_DAYS; None keeps the history forever.
+TODOS_ARCHIVE_COMPLETED_AFTER_DAYS = 90
+TODOS_PURGE_ARCHIVED_AFTER_DAYS = None
+
+# Logging
+# https://docs.djangoproject.com/en/4.2/topics/logging/
+# todos.access_log.AccessLogMiddleware writes one JSON line per sampled request
+# (TODO_ACCESS_LOG_SAMPLE_RATE, 0-1) to the todos.access logger; requests slower
+# than TODO_SLOW_REQUEST_MS are always logged, and statements slower than
+# TODO_SLOW_QUERY_MS are included for todos views. Lines go to stderr, or to
+# TODO_ACCESS_LOG_FILE, from a background thread.
+TODOS_ACCESS_LOG_SAMPLE_RATE = float(os.environ.get('TODO_ACCESS_LOG_SAMPLE_RATE', 1))
+TODOS_SLOW_REQUEST_MS = float(os.environ.get('TODO_SLOW_REQUEST_MS', 500))
+TODOS_SLOW_QUERY_MS = float(os.environ.get('TODO_SLOW_QUERY_MS', 100))
+
+TODOS_ACCESS_LOG_FILE = os.environ.get('TODO_ACCESS_LOG_FILE')
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'todos.access_log.JsonFormatter'},
+    },
+    'handlers': {
+        'access': {
+            '()': 'todos.access_log.BackgroundHandler',
+            'formatter': 'json',
+            **({'target': 'logging.FileHandler', 'filename': TODOS_ACCESS_LOG_FILE} if TODOS_ACCESS_LOG_FILE else {}),
+        },
+    },
+    'loggers': {
+        'todos.access': {
+            'handlers': ['access'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+# Quiets the access log while tests run (see todos/test_runner.py).
+TEST_RUNNER = 'todos.test_runner.TodosTestRunner'
+
 # Authentication settings
-LOGIN_REDIRECT_URL = '/'
-LOGOUT_REDIRECT_URL = '/login/'
-LOGIN_URL = '/login/'
+# (LOGIN_URL, LOGIN_REDIRECT_URL, LOGOUT_REDIRECT_URL) per worker role; the
+# admin role only routes the admin site, so users sign in and out there.
+ROLE_AUTH_URLS = {
+    'admin': ('admin:login', 'admin:index', 'admin:login'),
+}
+LOGIN_URL, LOGIN_REDIRECT_URL, LOGOUT_REDIRECT_URL = ROLE_AUTH_URLS.get(TODOS_ROLE, ('/login/', '/', '/login/'))
@@ -14,7 +14,7 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include
 from django.conf.urls.i18n import i18n_patterns
 
@@ -22,7 +22,16 @@ urlpatterns = [
     path('i18n/', include('django.conf.urls.i18n')),
 ]
 
+# The 'web' role (see TODO_ROLE in settings) runs without the admin.
+# Importing django.contrib.admin loads the admin site and its dependencies,
+# so only do it when the role serves it.
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns += i18n_patterns(
+        path('admin/', admin.site.urls),
+    )
+
 urlpatterns += i18n_patterns(
-    path('admin/', admin.site.urls),
     path('', include('todos.urls')),
 )
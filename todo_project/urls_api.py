@@ -0,0 +1,13 @@
+"""
+URL configuration for the 'api' worker role (TODO_ROLE=api).
+
+Only the JSON endpoints are routed; pages, login and the admin are served by
+the 'web' and 'admin' roles.
+"""
+from django.urls import path
+from django.conf.urls.i18n import i18n_patterns
+from todos import views
+
+urlpatterns = i18n_patterns(
+    path('api/calendar/', views.todo_calendar_api, name='todo_calendar_api'),
+)
@@ -0,0 +1,167 @@
+"""
+Structured access and query logging.
+
+``AccessLogMiddleware`` logs one JSON object per request to the
+``todos.access`` logger: view name, user id, status, duration and query
+count, plus the slowest SQL statements of ``todos`` views. Requests are
+sampled at ``TODOS_ACCESS_LOG_SAMPLE_RATE``; requests slower than
+``TODOS_SLOW_REQUEST_MS`` are always logged.
+
+The request thread only builds a dict and puts the record on a queue;
+``BackgroundHandler`` formats and writes it from a listener thread.
+"""
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from logging.handlers import QueueListener
+
+from django.conf import settings
+from django.db import connections
+from django.utils.functional import SimpleLazyObject
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger('todos.access')
+
+# At most this many slow statements are kept per request.
+MAX_SLOW_QUERIES = 10
+
+
+class QueryRecorder:
+    """``connection.execute_wrapper`` that counts queries and keeps the slow ones."""
+
+    def __init__(self, slow_seconds):
+        self.slow_seconds = slow_seconds
+        self.count = 0
+        self.seconds = 0.0
+        self.slow = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.seconds += elapsed
+            if elapsed >= self.slow_seconds and len(self.slow) < MAX_SLOW_QUERIES:
+                # Parameters are left out: they may contain user data.
+                self.slow.append({'sql': sql, 'ms': round(elapsed * 1000, 2)})
+
+
+def request_user_id(request):
+    """The user's id, without loading the user if nothing in the request did."""
+    user = request.__dict__.get('user')
+    if isinstance(user, SimpleLazyObject):
+        user = getattr(request, '_cached_user', None)
+    return getattr(user, 'pk', None)
+
+
+class AccessLogMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not logger.isEnabledFor(logging.INFO):
+            return self.get_response(request)
+
+        recorder = QueryRecorder(settings.TODOS_SLOW_QUERY_MS / 1000)
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        slow = duration_ms >= settings.TODOS_SLOW_REQUEST_MS
+        if slow or random.random() < settings.TODOS_ACCESS_LOG_SAMPLE_RATE:
+            match = request.resolver_match
+            entry = {
+                'method': request.method,
+                'path': request.path,
+                'view': match.view_name if match else None,
+                'user_id': request_user_id(request),
+                'status': response.status_code,
+                'duration_ms': round(duration_ms, 2),
+                'queries': recorder.count,
+                'query_ms': round(recorder.seconds * 1000, 2),
+                'slow': slow,
+            }
+            if recorder.slow and match and match.func.__module__.startswith('todos.'):
+                entry['slow_queries'] = recorder.slow
+            logger.info('%s %s', request.method, request.path, extra={'access': entry})
+        return response
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; access records contribute their fields."""
+
+    def format(self, record):
+        data = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+        }
+        access = getattr(record, 'access', None)
+        if access is not None:
+            data.update(access)
+        else:
+            data['message'] = record.getMessage()
+        return json.dumps(data, default=str)
+
+
+class BackgroundHandler(logging.Handler):
+    """
+    Non-blocking handler for ``dictConfig``: records are queued and written
+    by ``target`` (a handler class path, built with the remaining keyword
+    arguments) from a ``QueueListener`` thread. The formatter configured on
+    this handler is applied by the target, i.e. off the request thread.
+    When the queue is full, records are dropped and counted in ``dropped``.
+
+    It is not a ``QueueHandler``: from Python 3.12 ``dictConfig`` builds
+    those itself and requires a ``handlers`` list.
+    """
+
+    def __init__(self, target='logging.StreamHandler', maxsize=10000, **kwargs):
+        super().__init__()
+        self.target = import_string(target)(**kwargs)
+        self.maxsize = maxsize
+        self.queue = None
+        self.listener = None
+        self.pid = None
+        self.start_lock = threading.Lock()
+        self.dropped = 0
+
+    def setFormatter(self, fmt):
+        self.target.setFormatter(fmt)
+
+    def start(self):
+        # Start the listener lazily so that forked workers get their own
+        # queue and thread instead of the parent's.
+        with self.start_lock:
+            if self.pid != os.getpid():
+                self.queue = queue.Queue(self.maxsize)
+                self.listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+                self.listener.start()
+                self.pid = os.getpid()
+
+    def emit(self, record):
+        if self.pid != os.getpid():
+            self.start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        with self.start_lock:
+            if self.listener is not None and self.pid == os.getpid():
+                self.listener.stop()
+                self.listener = None
+        self.target.close()
+        super().close()
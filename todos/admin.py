@@ -1,5 +1,26 @@
 from django.contrib import admin
-from .models import Todo
+from .models import ArchivedTodo, Job, OccurrenceCompletion, Todo, TodoRecurrence
+
+
+class TodoRecurrenceInline(admin.StackedInline):
+    model = TodoRecurrence
+    extra = 0
+    max_num = 1
+
+
+class OccurrenceCompletionInline(admin.TabularInline):
+    model = OccurrenceCompletion
+    extra = 0
+    readonly_fields = ['completed_at']
+
+
+@admin.register(TodoRecurrence)
+class TodoRecurrenceAdmin(admin.ModelAdmin):
+    list_display = ['todo', 'frequency', 'interval', 'count', 'until']
+    list_filter = ['frequency']
+    list_select_related = ['todo']
+    raw_id_fields = ['todo']
+    inlines = [OccurrenceCompletionInline]
 
 
 @admin.register(Todo)
@@ -9,3 +30,23 @@ class TodoAdmin(admin.ModelAdmin):
     search_fields = ['title', 'description', 'user__username']
     readonly_fields = ['created_at', 'updated_at']
     date_hierarchy = 'created_at'
+    inlines = [TodoRecurrenceInline]
+
+
+@admin.register(ArchivedTodo)
+class ArchivedTodoAdmin(admin.ModelAdmin):
+    list_display = ['title', 'user', 'due_date', 'created_at', 'archived_at']
+    list_filter = ['archived_at', 'due_date']
+    list_select_related = ['user']
+    search_fields = ['title', 'description', 'user__username']
+    date_hierarchy = 'archived_at'
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'run_at', 'attempts', 'locked_by', 'finished_at']
+    list_filter = ['status', 'name']
+    readonly_fields = ['created_at', 'finished_at', 'locked_at', 'locked_by', 'result', 'last_error']
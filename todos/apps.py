@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class TodosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'todos'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        if settings.USE_I18N and getattr(settings, 'TODOS_PRELOAD_TRANSLATIONS', False):
+            from .i18n import preload_translations
+            preload_translations()
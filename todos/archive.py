@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ArchivedTodo, Todo
+
+
+def archive_completed_todos(older_than_days=None, batch_size=500):
+    """
+    Move completed TODOs not touched for ``older_than_days`` days (default
+    ``TODOS_ARCHIVE_COMPLETED_AFTER_DAYS``) into ArchivedTodo. Recurring TODOs
+    stay put: deleting them would drop their OccurrenceCompletion history.
+
+    Each batch is copied and deleted in its own short transaction, so the hot
+    table never stays locked for long. Returns the number of TODOs archived.
+    """
+    if older_than_days is None:
+        older_than_days = settings.TODOS_ARCHIVE_COMPLETED_AFTER_DAYS
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    old = Todo.objects.filter(
+        is_completed=True, updated_at__lt=cutoff, recurrence__isnull=True,
+    ).order_by('pk')
+
+    archived = 0
+    while True:
+        with transaction.atomic():
+            batch = list(old.select_for_update(of=('self',))[:batch_size])
+            if not batch:
+                return archived
+            ArchivedTodo.objects.bulk_create([
+                ArchivedTodo(
+                    original_id=todo.pk,
+                    title=todo.title,
+                    description=todo.description,
+                    due_date=todo.due_date,
+                    created_at=todo.created_at,
+                    updated_at=todo.updated_at,
+                    user_id=todo.user_id,
+                )
+                for todo in batch
+            ])
+            Todo.objects.filter(pk__in=[todo.pk for todo in batch]).delete()
+            archived += len(batch)
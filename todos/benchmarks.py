@@ -0,0 +1,79 @@
+"""
+Shared helpers for the ``bench_*`` management commands.
+
+Benchmarks run against the configured database, inside a transaction that is
+rolled back afterwards, so they never leave rows behind.
+"""
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+def summarize(timings):
+    """Summarize a list of durations (seconds) as milliseconds."""
+    ordered = sorted(timings)
+    return {
+        'count': len(ordered),
+        'mean': statistics.fmean(ordered) * 1000 if ordered else 0.0,
+        'p50': percentile(ordered, 50) * 1000,
+        'p95': percentile(ordered, 95) * 1000,
+        'p99': percentile(ordered, 99) * 1000,
+        'max': ordered[-1] * 1000 if ordered else 0.0,
+    }
+
+
+def measure(func, iterations):
+    """Call ``func`` ``iterations`` times and summarize the wall-clock timings."""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+def format_stats(label, stats):
+    return (
+        f"{label:<24} n={stats['count']:<5} mean={stats['mean']:8.2f}ms "
+        f"p50={stats['p50']:8.2f}ms p95={stats['p95']:8.2f}ms "
+        f"p99={stats['p99']:8.2f}ms max={stats['max']:8.2f}ms"
+    )
+
+
+@contextmanager
+def sandbox():
+    """
+    Run the block in a transaction that is always rolled back, with the test
+    client's host allowed.
+    """
+    with transaction.atomic(), override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+        yield
+        transaction.set_rollback(True)
+
+
+@contextmanager
+def bench_client(username='bench-user'):
+    """
+    Yield a test ``Client`` logged in as a throwaway user. The user, its
+    session and anything the benchmark creates are rolled back on exit.
+    """
+    with sandbox():
+        user = User.objects.create(username=username)
+        client = Client()
+        client.force_login(user)
+        client.user = user
+        yield client
@@ -1,8 +1,35 @@
+import copy
+
 from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm
 from django.utils.translation import gettext_lazy as _
-from .models import Todo
+from .models import Todo, TodoRecurrence
+
+
+INPUT_CLASS = 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500'
+
+
+def override_fields(labels=None, widget_attrs=None):
+    """
+    Class decorator that sets labels and widget attrs on a form's
+    ``base_fields`` once, when the class is created, rather than in every
+    ``__init__``. Inherited fields are copied first so the parent form class
+    keeps its own widgets.
+    """
+    labels = labels or {}
+    widget_attrs = widget_attrs or {}
+
+    def decorator(form_class):
+        for name in {*labels, *widget_attrs}:
+            field = copy.deepcopy(form_class.base_fields[name])
+            if name in labels:
+                field.label = labels[name]
+            field.widget.attrs.update(widget_attrs.get(name, {}))
+            form_class.base_fields[name] = field
+        return form_class
+
+    return decorator
 
 
 class TodoForm(forms.ModelForm):
@@ -11,7 +38,15 @@ class TodoForm(forms.ModelForm):
         required=False,
         widget=forms.DateInput(attrs={
             'type': 'date',
-            'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500'
+            'class': INPUT_CLASS,
+        })
+    )
+    repeat = forms.ChoiceField(
+        label=_('Repeat'),
+        required=False,
+        choices=[('', _('Does not repeat'))] + TodoRecurrence.Frequency.choices,
+        widget=forms.Select(attrs={
+            'class': INPUT_CLASS,
         })
     )
 
@@ -24,23 +59,70 @@ class TodoForm(forms.ModelForm):
         }
         widgets = {
             'title': forms.TextInput(attrs={
-                'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500',
+                'class': INPUT_CLASS,
                 'placeholder': _('Enter todo title')
             }),
             'description': forms.Textarea(attrs={
-                'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500',
+                'class': INPUT_CLASS,
                 'rows': 3,
                 'placeholder': _('Enter todo description (optional)')
             }),
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # TodoUpdateView selects the recurrence along with the TODO.
+        recurrence = getattr(self.instance, 'recurrence', None)
+        if recurrence is not None:
+            self.fields['repeat'].initial = recurrence.frequency
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get('repeat') and not cleaned_data.get('due_date'):
+            self.add_error('due_date', _('Repeating TODOs need a due date to start from.'))
+        return cleaned_data
+
+    def save(self, commit=True):
+        todo = super().save(commit=commit)
+        if commit:
+            self.save_recurrence()
+        return todo
+
+    def save_recurrence(self):
+        """
+        Create, update or remove the TODO's recurrence rule to match ``repeat``.
+        Called by ``save()``; call it yourself after ``save(commit=False)``.
+        """
+        frequency = self.cleaned_data.get('repeat')
+        recurrence = getattr(self.instance, 'recurrence', None)
+        if not frequency:
+            if recurrence is not None:
+                recurrence.delete()
+        elif recurrence is None:
+            TodoRecurrence.objects.create(todo=self.instance, frequency=frequency)
+        elif recurrence.frequency != frequency:
+            # Weekdays only make sense for the weekly rule they were set on.
+            recurrence.frequency = frequency
+            recurrence.weekdays = ''
+            recurrence.save()
+
 
+@override_fields(
+    labels={
+        'password1': _('Password'),
+        'password2': _('Confirm Password'),
+    },
+    widget_attrs={
+        'password1': {'class': INPUT_CLASS, 'placeholder': _('Enter password')},
+        'password2': {'class': INPUT_CLASS, 'placeholder': _('Confirm password')},
+    },
+)
 class UserRegistrationForm(UserCreationForm):
     email = forms.EmailField(
         label=_('Email'),
         required=True,
         widget=forms.EmailInput(attrs={
-            'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500',
+            'class': INPUT_CLASS,
             'placeholder': _('Enter your email')
         })
     )
@@ -53,20 +135,7 @@ class UserRegistrationForm(UserCreationForm):
         }
         widgets = {
             'username': forms.TextInput(attrs={
-                'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500',
+                'class': INPUT_CLASS,
                 'placeholder': _('Choose a username')
             }),
         }
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.fields['password1'].label = _('Password')
-        self.fields['password2'].label = _('Confirm Password')
-        self.fields['password1'].widget.attrs.update({
-            'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500',
-            'placeholder': _('Enter password')
-        })
-        self.fields['password2'].widget.attrs.update({
-            'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500',
-            'placeholder': _('Confirm password')
-        })
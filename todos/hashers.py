@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+from django.core.exceptions import ImproperlyConfigured
+
+
+class TunedHasherMixin:
+    """
+    Take the hasher's cost parameters from
+    ``settings.TODOS_PASSWORD_HASHER_PARAMS[params_key]`` instead of the
+    Django defaults.
+
+    The algorithm name is unchanged, so existing hashes still verify; when the
+    configured cost differs from a stored hash, Django's ``must_update()``
+    rehashes the password transparently on the next successful login.
+    """
+    params_key = None
+
+    def __init__(self):
+        params = getattr(settings, 'TODOS_PASSWORD_HASHER_PARAMS', {}).get(self.params_key, {})
+        for name, value in params.items():
+            if not hasattr(self, name):
+                raise ImproperlyConfigured(
+                    f"Unknown {self.params_key} hasher parameter {name!r} in TODOS_PASSWORD_HASHER_PARAMS."
+                )
+            setattr(self, name, value)
+
+
+class TunedPBKDF2PasswordHasher(TunedHasherMixin, PBKDF2PasswordHasher):
+    params_key = 'pbkdf2'
+
+
+class TunedScryptPasswordHasher(TunedHasherMixin, ScryptPasswordHasher):
+    params_key = 'scrypt'
+
+
+class TunedArgon2PasswordHasher(TunedHasherMixin, Argon2PasswordHasher):
+    """Requires the ``argon2-cffi`` package."""
+    params_key = 'argon2'
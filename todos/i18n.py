@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.utils import translation
+from django.utils.translation import trans_real
+
+
+def preload_translations(languages=None):
+    """
+    Load the gettext catalogs for the configured languages into the
+    per-process translation cache, so the first request in each language
+    doesn't pay for reading the .mo files.
+
+    Returns the list of language codes that were loaded.
+    """
+    if languages is None:
+        languages = [code for code, name in settings.LANGUAGES]
+
+    loaded = []
+    for code in languages:
+        try:
+            # Also primes the lru caches LocaleMiddleware relies on.
+            code = translation.get_supported_language_variant(code)
+        except LookupError:
+            continue
+        trans_real.translation(code)
+        loaded.append(code)
+    return loaded
@@ -0,0 +1,146 @@
+"""
+A small database-backed job queue for maintenance work that shouldn't run
+inside a request.
+
+Jobs are registered with ``@job('name')``, queued with ``enqueue()`` and run
+by ``python manage.py run_jobs``. On databases with row locks (PostgreSQL) a
+job is claimed with ``SELECT ... FOR UPDATE SKIP LOCKED``; elsewhere (SQLite)
+a conditional UPDATE makes sure only one worker wins each job.
+"""
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .archive import archive_completed_todos
+from .models import ArchivedTodo, Job
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+# Delay before retrying a failed job, doubled on every attempt.
+RETRY_DELAY = timedelta(seconds=30)
+
+
+def job(name):
+    """Register a function as the job ``name``; it's called with the job's payload as kwargs."""
+    def decorator(func):
+        registry[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, run_at=None, max_attempts=3, **payload):
+    if name not in registry:
+        raise KeyError(f'Unknown job {name!r}')
+    return Job.objects.create(
+        name=name, payload=payload, run_at=run_at or timezone.now(), max_attempts=max_attempts,
+    )
+
+
+def default_worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def claim_next(worker_id):
+    """Lock the next due job for ``worker_id`` and return it, or None."""
+    now = timezone.now()
+    due = Job.objects.filter(status=Job.Status.PENDING, run_at__lte=now).order_by('run_at', 'pk')
+    claim = {'status': Job.Status.RUNNING, 'locked_by': worker_id, 'locked_at': now}
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job = due.select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            Job.objects.filter(pk=job.pk).update(attempts=F('attempts') + 1, **claim)
+    else:
+        # No row locks: whoever flips the status first owns the job, a
+        # worker that loses the race just tries the next candidate.
+        for job_id in due.values_list('pk', flat=True)[:10]:
+            if Job.objects.filter(pk=job_id, status=Job.Status.PENDING).update(
+                attempts=F('attempts') + 1, **claim,
+            ):
+                break
+        else:
+            return None
+        job = Job(pk=job_id)
+
+    job.refresh_from_db()
+    return job
+
+
+def run_job(job):
+    """Run a claimed job and record its outcome; failures are retried with backoff."""
+    try:
+        func = registry[job.name]
+        job.result = func(**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = Job.Status.FAILED
+            job.finished_at = timezone.now()
+        else:
+            job.status = Job.Status.PENDING
+            job.run_at = timezone.now() + RETRY_DELAY * 2 ** (job.attempts - 1)
+        logger.exception('Job %s (%s) failed on attempt %d', job.pk, job.name, job.attempts)
+    else:
+        job.status = Job.Status.DONE
+        job.finished_at = timezone.now()
+    job.locked_by = ''
+    job.locked_at = None
+    job.save()
+    return job
+
+
+def requeue_stale(timeout):
+    """Put RUNNING jobs whose worker died more than ``timeout`` ago back in the queue."""
+    return Job.objects.filter(
+        status=Job.Status.RUNNING, locked_at__lt=timezone.now() - timeout,
+    ).update(status=Job.Status.PENDING, locked_by='', locked_at=None)
+
+
+def run_pending(worker_id=None, limit=None):
+    """Run due jobs until the queue is empty (or ``limit`` jobs ran); return how many ran."""
+    worker_id = worker_id or default_worker_id()
+    ran = 0
+    while limit is None or ran < limit:
+        job = claim_next(worker_id)
+        if job is None:
+            break
+        run_job(job)
+        ran += 1
+    return ran
+
+
+job('archive_completed_todos')(archive_completed_todos)
+
+
+@job('purge_archived_todos')
+def purge_archived_todos(older_than_days=None, batch_size=500):
+    """
+    Permanently delete ArchivedTodo rows archived more than ``older_than_days``
+    days ago (default ``TODOS_PURGE_ARCHIVED_AFTER_DAYS``; None keeps them
+    forever), one short transaction per batch.
+    """
+    if older_than_days is None:
+        older_than_days = settings.TODOS_PURGE_ARCHIVED_AFTER_DAYS
+    if older_than_days is None:
+        return 0
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    old = ArchivedTodo.objects.filter(archived_at__lt=cutoff).order_by('pk')
+
+    purged = 0
+    while True:
+        with transaction.atomic():
+            batch = list(old.values_list('pk', flat=True)[:batch_size])
+            if not batch:
+                return purged
+            purged += ArchivedTodo.objects.filter(pk__in=batch).delete()[0]
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from todos.archive import archive_completed_todos
+
+
+class Command(BaseCommand):
+    help = 'Move old completed TODOs into the archive table, in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days', type=int, default=None,
+            help='Defaults to settings.TODOS_ARCHIVE_COMPLETED_AFTER_DAYS.',
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        archived = archive_completed_todos(options['older_than_days'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} TODO(s)'))
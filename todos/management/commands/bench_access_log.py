@@ -0,0 +1,43 @@
+import logging
+import os
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from todos.access_log import BackgroundHandler, JsonFormatter, logger
+from todos.benchmarks import bench_client, format_stats, measure
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the request overhead of the access log: fast endpoints with the '
+        'todos.access logger off, and on at 100% sampling (written to os.devnull).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=500)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        handler = BackgroundHandler('logging.FileHandler', filename=os.devnull)
+        handler.setFormatter(JsonFormatter())
+        saved = logger.handlers, logger.level
+
+        with bench_client() as client, override_settings(
+            TODOS_ACCESS_LOG_SAMPLE_RATE=1.0, TODOS_CALENDAR_API_RATE=0,
+        ):
+            for name in ['login', 'todo_calendar_api']:
+                url = reverse(name)
+                for label, level in [('off', logging.WARNING), ('on', logging.INFO)]:
+                    logger.handlers, logger.level = [handler], level
+                    try:
+                        client.get(url)
+                        stats = measure(lambda: client.get(url), iterations)
+                    finally:
+                        logger.handlers, logger.level = saved
+                    self.stdout.write(format_stats(f'{name} {label}', stats))
+
+        handler.close()
+        if handler.dropped:
+            self.stdout.write(self.style.WARNING(f'{handler.dropped} record(s) dropped: queue full'))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from todos.benchmarks import bench_client, format_stats, measure
+from todos.forms import TodoForm, UserRegistrationForm
+
+
+def render_fields(form):
+    """Render every field the way the templates do (``{{ form.<name> }}``)."""
+    return [str(form[name]) for name in form.fields]
+
+
+class Command(BaseCommand):
+    help = 'Measure form construction, field rendering and form page render time.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=500)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        cases = [
+            ('TodoForm()', lambda: TodoForm()),
+            ('TodoForm render', lambda: render_fields(TodoForm())),
+            ('UserRegistrationForm()', lambda: UserRegistrationForm()),
+            ('UserRegistration render', lambda: render_fields(UserRegistrationForm())),
+        ]
+        for label, func in cases:
+            func()
+            self.stdout.write(format_stats(label, measure(func, iterations)))
+
+        page_iterations = max(1, iterations // 10)
+        with bench_client() as client:
+            create_url = reverse('todo_create')
+            client.get(create_url)
+            self.stdout.write(format_stats(
+                'GET todo_create', measure(lambda: client.get(create_url), page_iterations)
+            ))
+
+            anonymous = Client()
+            register_url = reverse('register')
+            anonymous.get(register_url)
+            self.stdout.write(format_stats(
+                'GET register', measure(lambda: anonymous.get(register_url), page_iterations)
+            ))
@@ -0,0 +1,57 @@
+import gettext
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test.signals import setting_changed
+
+from todos.benchmarks import bench_client, format_stats, measure
+from todos.i18n import preload_translations
+
+
+def reset_translation_caches():
+    """Drop every per-process translation cache, as in a freshly started worker."""
+    # Django's own receivers (in django.test.signals and trans_real) drop the
+    # loaded catalogs and language lookups when these settings change, as
+    # they do under override_settings.
+    for setting in ('LANGUAGES', 'LOCALE_PATHS'):
+        setting_changed.send(sender=None, setting=setting, value=getattr(settings, setting), enter=False)
+    # gettext also keeps every parsed .mo file in a private module cache;
+    # clear it so the first request reads the catalogs from disk again.
+    gettext._translations.clear()
+
+
+class Command(BaseCommand):
+    help = 'Measure cold (first request) and warm render time of a page per language.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument(
+            '--path', default='/{language}/',
+            help='Path to render; "{language}" is replaced by the language code.',
+        )
+        parser.add_argument(
+            '--preload', action='store_true',
+            help='Preload all catalogs before the first request, as TODOS_PRELOAD_TRANSLATIONS does.',
+        )
+
+    def handle(self, *args, **options):
+        languages = [code for code, name in settings.LANGUAGES]
+
+        with bench_client() as client:
+            # Warm up everything that isn't translation related (templates, URLs).
+            client.get(options['path'].format(language=settings.LANGUAGE_CODE))
+            reset_translation_caches()
+
+            if options['preload']:
+                start = time.perf_counter()
+                preload_translations()
+                self.stdout.write(f"preload: {(time.perf_counter() - start) * 1000:.2f}ms")
+
+            for language in languages:
+                path = options['path'].format(language=language)
+                start = time.perf_counter()
+                client.get(path)
+                cold = (time.perf_counter() - start) * 1000
+                stats = measure(lambda: client.get(path), options['iterations'])
+                self.stdout.write(f"{format_stats(language, stats)} cold={cold:8.2f}ms")
@@ -0,0 +1,72 @@
+from django.contrib.auth.hashers import get_hasher, get_hashers
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from todos.benchmarks import format_stats, measure, sandbox
+
+PASSWORD = 'bench-password-123'
+
+
+def logins_per_second(stats):
+    return 1000 / stats['mean'] if stats['mean'] else 0.0
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure password hashing cost per configured hasher and end-to-end '
+        'login throughput (single process, i.e. per core).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument(
+            '--hasher', action='append', dest='hashers', metavar='ALGORITHM',
+            help='Hasher algorithm to measure (repeatable); defaults to every usable PASSWORD_HASHERS entry.',
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+
+        for hasher in self.get_hashers(options['hashers']):
+            encoded = hasher.encode(PASSWORD, hasher.salt())
+            stats = measure(lambda: hasher.verify(PASSWORD, encoded), iterations)
+            self.stdout.write(
+                f"{format_stats('verify ' + hasher.algorithm, stats)} "
+                f"~{logins_per_second(stats):.1f} logins/s/core"
+            )
+
+        preferred = get_hasher('default')
+        with sandbox():
+            User.objects.create_user(username='bench-login', password=PASSWORD)
+            client = Client()
+            url = reverse('login')
+            data = {'username': 'bench-login', 'password': PASSWORD}
+
+            def login():
+                response = client.post(url, data)
+                if response.status_code != 302:
+                    raise RuntimeError(f'Login failed with status {response.status_code}')
+                client.cookies.clear()
+
+            login()
+            stats = measure(login, iterations)
+        self.stdout.write(
+            f"{format_stats('POST login (' + preferred.algorithm + ')', stats)} "
+            f"~{logins_per_second(stats):.1f} logins/s/core"
+        )
+
+    def get_hashers(self, algorithms):
+        hashers = []
+        for hasher in get_hashers():
+            if algorithms and hasher.algorithm not in algorithms:
+                continue
+            try:
+                if hasher.library:
+                    hasher._load_library()
+            except ValueError as exc:
+                self.stderr.write(f"skipping {hasher.algorithm}: {exc}")
+                continue
+            hashers.append(hasher)
+        return hashers
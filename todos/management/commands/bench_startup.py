@@ -0,0 +1,138 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Path requested as the first response for each role, and whether it needs
+# a logged-in user (the api role only serves authenticated JSON).
+ROLE_PATHS = {
+    'all': ('/en/login/', False),
+    'web': ('/en/login/', False),
+    'api': ('/en/api/calendar/', True),
+    'admin': ('/en/admin/login/', False),
+}
+
+# Run in a fresh interpreter: boot the WSGI application, then serve one request.
+FIRST_RESPONSE_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from todo_project.wsgi import application
+booted = time.perf_counter()
+from wsgiref.util import setup_testing_defaults
+environ = {'PATH_INFO': sys.argv[1]}
+setup_testing_defaults(environ)
+
+if sys.argv[2:] == ['--login']:
+    # Log a throwaway user in inside a transaction that is rolled back at the
+    # end, keeping the connection open across the request like the test client.
+    from importlib import import_module
+    from django.conf import settings
+    from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+    from django.contrib.auth.models import User
+    from django.core.signals import request_finished, request_started
+    from django.db import close_old_connections, transaction
+    request_started.disconnect(close_old_connections)
+    request_finished.disconnect(close_old_connections)
+    atomic = transaction.atomic()
+    atomic.__enter__()
+    user = User.objects.create(username='bench-startup')
+    session = import_module(settings.SESSION_ENGINE).SessionStore()
+    session[SESSION_KEY] = str(user.pk)
+    session[BACKEND_SESSION_KEY] = 'django.contrib.auth.backends.ModelBackend'
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.save()
+    environ['HTTP_COOKIE'] = f'{settings.SESSION_COOKIE_NAME}={session.session_key}'
+
+status = []
+requested = time.perf_counter()
+body = b''.join(application(environ, lambda s, h, *a: status.append(s)))
+done = time.perf_counter()
+
+if sys.argv[2:] == ['--login']:
+    transaction.set_rollback(True)
+    atomic.__exit__(None, None, None)
+
+print(json.dumps({
+    'boot_ms': (booted - start) * 1000,
+    'first_response_ms': (booted - start + done - requested) * 1000,
+    'status': status[0],
+}))
+"""
+
+
+def parse_importtime(stderr):
+    """
+    Return (total self time in ms, [(cumulative ms, depth, module)]) from
+    ``-X importtime`` output; depth 0 is imported directly by the script.
+    """
+    total = 0
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        total += int(self_us)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((int(cumulative_us) / 1000, depth, name.strip()))
+    return total / 1000, modules
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure import time (-X importtime) and time to first response of a '
+        'fresh process for each TODO_ROLE.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--role', action='append', dest='roles', choices=sorted(ROLE_PATHS),
+            help='Role to measure (repeatable); defaults to all roles.',
+        )
+        parser.add_argument('--repeat', type=int, default=5, help='Fresh processes per role.')
+        parser.add_argument('--top', type=int, default=5, help='Slowest imports to list per role.')
+
+    def handle(self, *args, **options):
+        for role in options['roles'] or list(ROLE_PATHS):
+            env = {**os.environ, 'TODO_ROLE': role, 'DJANGO_SETTINGS_MODULE': 'todo_project.settings'}
+            path, login = ROLE_PATHS[role]
+            script_args = ['-c', FIRST_RESPONSE_SCRIPT, path, *(['--login'] if login else [])]
+
+            imports = []
+            for _ in range(options['repeat']):
+                result = self.run_python(['-X', 'importtime', *script_args], env)
+                imports.append(parse_importtime(result.stderr))
+
+            runs = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                result = self.run_python(script_args, env)
+                wall_ms = (time.perf_counter() - start) * 1000
+                runs.append({**json.loads(result.stdout), 'wall_ms': wall_ms})
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"role={role} path={path}{' (logged in)' if login else ''}"))
+            self.stdout.write(
+                f"  imports          median={statistics.median(t for t, _ in imports):8.1f}ms"
+            )
+            for key, label in [('boot_ms', 'wsgi boot'), ('first_response_ms', 'first response'),
+                               ('wall_ms', 'process wall')]:
+                values = [run[key] for run in runs]
+                self.stdout.write(
+                    f"  {label:<16} median={statistics.median(values):8.1f}ms min={min(values):8.1f}ms"
+                )
+            self.stdout.write(f"  status           {runs[-1]['status']}")
+
+            # Direct imports of the WSGI module and of Django's setup.
+            nested = [(ms, name) for ms, depth, name in imports[-1][1] if depth == 1]
+            for ms, name in sorted(nested, reverse=True)[:options['top']]:
+                self.stdout.write(f"    {ms:8.1f}ms  {name}")
+
+    def run_python(self, args, env):
+        return subprocess.run(
+            [sys.executable, *args], env=env, cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        )
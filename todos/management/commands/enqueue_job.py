@@ -0,0 +1,33 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from todos import jobs
+
+
+class Command(BaseCommand):
+    help = 'Queue a background job for the run_jobs worker, e.g. from cron.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', help=f"Job name: {', '.join(sorted(jobs.registry))}.")
+        parser.add_argument(
+            'params', nargs='*', metavar='key=value',
+            help='Job arguments; values are parsed as JSON when possible.',
+        )
+
+    def handle(self, *args, **options):
+        payload = {}
+        for param in options['params']:
+            key, sep, value = param.partition('=')
+            if not sep:
+                raise CommandError(f'Expected key=value, got {param!r}')
+            try:
+                payload[key] = json.loads(value)
+            except ValueError:
+                payload[key] = value
+
+        try:
+            job = jobs.enqueue(options['name'], **payload)
+        except KeyError as exc:
+            raise CommandError(exc.args[0])
+        self.stdout.write(self.style.SUCCESS(f'Queued {job.name} #{job.pk}'))
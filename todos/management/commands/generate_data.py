@@ -0,0 +1,113 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from todos.models import Todo, TodoRecurrence
+
+WORDS = (
+    'lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor '
+    'incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud '
+    'exercitation ullamco laboris nisi aliquip ex ea commodo consequat'
+).split()
+
+
+def text(rng, length):
+    """Roughly ``length`` characters of filler text."""
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return ' '.join(words)[:length]
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic users and TODOs with bulk_create for local load testing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--todos-per-user', type=int, default=50, help='Mean number of TODOs per user.')
+        parser.add_argument(
+            '--todos-spread', type=float, default=0.5,
+            help='Per-user TODO count varies uniformly by this fraction of the mean.',
+        )
+        parser.add_argument(
+            '--due-spread', type=int, default=60,
+            help='Due dates fall uniformly within this many days before or after today.',
+        )
+        parser.add_argument('--no-due-ratio', type=float, default=0.2, help='Fraction of TODOs without a due date.')
+        parser.add_argument('--completion-ratio', type=float, default=0.3)
+        parser.add_argument('--recurring-ratio', type=float, default=0.0, help='Fraction of TODOs that repeat weekly.')
+        parser.add_argument('--description-length', type=int, default=80, help='Mean description length in characters.')
+        parser.add_argument('--prefix', default='loaduser', help='Username prefix; users are <prefix><n>.')
+        parser.add_argument('--password', default='loadtest-pass-123')
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        for name in ['no_due_ratio', 'completion_ratio', 'recurring_ratio', 'todos_spread']:
+            if not 0 <= options[name] <= 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be between 0 and 1")
+
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        prefix = options['prefix']
+
+        # Hashing is deliberately slow, so every generated user shares one hash.
+        password = make_password(options['password'])
+        # Continue after the highest existing <prefix><n>; counting the
+        # matches would clash once a user was deleted or a name like
+        # <prefix>admin exists.
+        suffixes = (
+            name[len(prefix):]
+            for name in User.objects.filter(username__startswith=prefix).values_list('username', flat=True).iterator()
+        )
+        first = max((int(suffix) + 1 for suffix in suffixes if suffix.isdigit()), default=0)
+        usernames = [f'{prefix}{n}' for n in range(first, first + options['users'])]
+        User.objects.bulk_create(
+            [User(username=username, password=password) for username in usernames],
+            batch_size=batch_size,
+        )
+        user_ids = list(User.objects.filter(username__in=usernames).values_list('pk', flat=True))
+
+        today = timezone.now().date()
+        mean = options['todos_per_user']
+        spread = int(mean * options['todos_spread'])
+        todos = []
+        repeating = []
+        for user_id in user_ids:
+            for n in range(max(0, mean + rng.randint(-spread, spread))):
+                due_date = None
+                if rng.random() >= options['no_due_ratio']:
+                    due_date = today + timedelta(days=rng.randint(-options['due_spread'], options['due_spread']))
+                description_length = int(rng.expovariate(1 / options['description_length'])) \
+                    if options['description_length'] else 0
+                todos.append(Todo(
+                    user_id=user_id,
+                    title=text(rng, rng.randint(10, 60)).capitalize(),
+                    description=text(rng, description_length),
+                    due_date=due_date,
+                    is_completed=rng.random() < options['completion_ratio'],
+                ))
+                repeating.append(due_date is not None and rng.random() < options['recurring_ratio'])
+
+        Todo.objects.bulk_create(todos, batch_size=batch_size)
+
+        recurring = [todo for todo, repeats in zip(todos, repeating) if repeats]
+        if recurring:
+            if recurring[0].pk is None:
+                raise CommandError('This database backend does not return primary keys from bulk_create.')
+            TodoRecurrence.objects.bulk_create(
+                [TodoRecurrence(todo=todo, frequency=TodoRecurrence.Frequency.WEEKLY) for todo in recurring],
+                batch_size=batch_size,
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {len(user_ids)} user(s) ({usernames[0] if usernames else "-"}..) '
+            f'with {len(todos)} TODO(s), {len(recurring)} recurring. Password: {options["password"]}'
+        ))
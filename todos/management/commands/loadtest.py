@@ -0,0 +1,185 @@
+import http.cookiejar
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from todos.benchmarks import format_stats, summarize
+
+# Relative weight of each action in the request mix.
+ACTIONS = {
+    'list': 4,
+    'calendar_api': 4,
+    'create': 1,
+    'toggle': 1,
+}
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Report redirects as responses instead of following them."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class VirtualUser:
+    """One logged-in user with its own cookie jar, driving the app over HTTP."""
+
+    def __init__(self, base_url, language, username, password, rng):
+        self.base_url = base_url.rstrip('/')
+        self.language = language
+        self.username = username
+        self.password = password
+        self.rng = rng
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies), NoRedirect,
+        )
+        self.todo_ids = []
+
+    def url(self, path):
+        return f'{self.base_url}/{self.language}{path}'
+
+    def request(self, path, data=None):
+        body = None
+        headers = {}
+        if data is not None:
+            data = {**data, 'csrfmiddlewaretoken': self.csrf_token()}
+            body = urllib.parse.urlencode(data).encode()
+            headers['Referer'] = self.url(path)
+        request = urllib.request.Request(self.url(path), data=body, headers=headers)
+        try:
+            with self.opener.open(request, timeout=30) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            # Redirects (NoRedirect) and error statuses both end up here.
+            return exc.code, b''
+
+    def csrf_token(self):
+        for cookie in self.cookies:
+            if cookie.name == 'csrftoken':
+                return cookie.value
+        return ''
+
+    def login(self):
+        self.request('/login/')
+        status = self.request('/login/', {'username': self.username, 'password': self.password})[0]
+        if status != 302:
+            raise ValueError(f'login failed for {self.username}')
+        return status
+
+    def list(self):
+        return self.request('/')[0]
+
+    def calendar_api(self):
+        start = date.today().replace(day=1) - timedelta(days=7)
+        query = urllib.parse.urlencode({'start': start.isoformat(), 'end': (start + timedelta(days=42)).isoformat()})
+        status, body = self.request(f'/api/calendar/?{query}')
+        # Error bodies (e.g. the plain-text 429) are not event lists.
+        if status == 200:
+            self.todo_ids = sorted({event['id'] for event in json.loads(body) if isinstance(event['id'], int)})
+        return status
+
+    def create(self):
+        due_date = date.today() + timedelta(days=self.rng.randint(-7, 30))
+        return self.request('/create/', {'title': f'Load test {self.rng.random():.6f}', 'due_date': due_date})[0]
+
+    def toggle(self):
+        if not self.todo_ids:
+            self.calendar_api()
+        if not self.todo_ids:
+            return self.create()
+        return self.request(f'/toggle/{self.rng.choice(self.todo_ids)}/', {})[0]
+
+
+class Command(BaseCommand):
+    help = (
+        'Drive login, list, calendar API, create and toggle concurrently against a '
+        'running server (runserver, uvicorn, gunicorn) and report throughput and '
+        'latency percentiles. Generate the users first with generate_data.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument('--language', default='en')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent virtual users.')
+        parser.add_argument('--duration', type=float, default=30.0, help='Seconds to run each virtual user.')
+        parser.add_argument('--requests', type=int, help='Stop each virtual user after this many requests.')
+        parser.add_argument('--prefix', default='loaduser', help='Username prefix used by generate_data.')
+        parser.add_argument('--users', type=int, default=None, help='Spread the virtual users over this many accounts.')
+        parser.add_argument('--password', default='loadtest-pass-123')
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        concurrency = options['concurrency']
+        accounts = options['users'] or concurrency
+        timings = defaultdict(list)
+        errors = defaultdict(int)
+        throttled = defaultdict(int)
+        lock = threading.Lock()
+
+        def record(action, func):
+            """Time one action; return whether it succeeded."""
+            start = time.perf_counter()
+            try:
+                status = func()
+            except (OSError, ValueError) as exc:
+                with lock:
+                    errors[f'{action}: {exc}'] += 1
+                return False
+            elapsed = time.perf_counter() - start
+            with lock:
+                timings[action].append(elapsed)
+                if status == 429:
+                    throttled[action] += 1
+                elif status >= 400:
+                    errors[f'{action}: HTTP {status}'] += 1
+            return status < 400
+
+        seeds = [rng.random() for _ in range(concurrency)]
+
+        def run(index):
+            user = VirtualUser(
+                options['url'], options['language'], f"{options['prefix']}{index % accounts}",
+                options['password'], random.Random(seeds[index]),
+            )
+            if not record('login', user.login):
+                return
+            deadline = time.monotonic() + options['duration']
+            done = 0
+            actions, weights = zip(*ACTIONS.items())
+            while time.monotonic() < deadline and (options['requests'] is None or done < options['requests']):
+                action = user.rng.choices(actions, weights)[0]
+                record(action, getattr(user, action))
+                done += 1
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for future in [pool.submit(run, index) for index in range(concurrency)]:
+                future.result()
+        elapsed = time.perf_counter() - started
+
+        total = sum(len(values) for values in timings.values())
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'{total} requests in {elapsed:.1f}s with {concurrency} virtual users: {total / elapsed:.1f} req/s'
+        ))
+        for action in ['login', *ACTIONS]:
+            if timings[action]:
+                stats = summarize(timings[action])
+                self.stdout.write(f"{format_stats(action, stats)} {len(timings[action]) / elapsed:7.1f} req/s")
+        self.stdout.write(format_stats('all', summarize([t for values in timings.values() for t in values])))
+        for action, count in sorted(throttled.items()):
+            self.stdout.write(self.style.WARNING(f'{count:6d} x {action}: rate limited (429)'))
+        for error, count in sorted(errors.items()):
+            self.stderr.write(f'{count:6d} x {error}')
+        if errors:
+            raise CommandError(f'{sum(errors.values())} request(s) failed')
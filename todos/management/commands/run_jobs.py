@@ -0,0 +1,50 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from todos import jobs
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--burst', action='store_true',
+            help='Exit once the queue is empty instead of polling for new jobs.',
+        )
+        parser.add_argument('--sleep', type=float, default=5.0, help='Seconds between polls of an empty queue.')
+        parser.add_argument('--max-jobs', type=int, help='Exit after running this many jobs.')
+        parser.add_argument(
+            '--stale-after', type=int, default=3600,
+            help='Requeue jobs left running by a dead worker for this many seconds.',
+        )
+        parser.add_argument('--worker-id', default=None)
+
+    def handle(self, *args, **options):
+        worker_id = options['worker_id'] or jobs.default_worker_id()
+        remaining = options['max_jobs']
+        stale_after = timedelta(seconds=options['stale_after'])
+
+        while remaining is None or remaining > 0:
+            requeued = jobs.requeue_stale(stale_after)
+            if requeued:
+                self.stderr.write(f'Requeued {requeued} stale job(s)')
+
+            job = jobs.claim_next(worker_id)
+            if job is None:
+                if options['burst']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+
+            start = time.perf_counter()
+            jobs.run_job(job)
+            elapsed = (time.perf_counter() - start) * 1000
+            style = self.style.SUCCESS if job.status == job.Status.DONE else self.style.ERROR
+            self.stdout.write(style(
+                f'{job.name} #{job.pk}: {job.get_status_display()} in {elapsed:.1f}ms (result={job.result!r})'
+            ))
+            if remaining is not None:
+                remaining -= 1
@@ -0,0 +1,71 @@
+import copy
+import time
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+
+# Per-process cache of authenticated users: (user_id, backend_path) -> (expires_at, user).
+_user_cache = {}
+MAX_CACHED_USERS = 10000
+
+
+def clear_user_cache(user_id=None):
+    """Forget one cached user (by primary key), or all of them."""
+    if user_id is None:
+        _user_cache.clear()
+        return
+    for key in [key for key in list(_user_cache) if key[0] == str(user_id)]:
+        _user_cache.pop(key, None)
+
+
+def get_cached_user(request):
+    """
+    Like ``django.contrib.auth.get_user()``, but keeps authenticated users in
+    a per-process cache for ``TODOS_USER_CACHE_TTL`` seconds, so repeated
+    requests from the same user skip the ``auth_user`` query.
+
+    Cached users are still checked against the session auth hash, and are
+    evicted whenever the user is saved or deleted in this process.
+    """
+    ttl = getattr(settings, 'TODOS_USER_CACHE_TTL', 0)
+    user_id = request.session.get(SESSION_KEY)
+    backend_path = request.session.get(BACKEND_SESSION_KEY)
+    if not ttl or user_id is None or backend_path is None:
+        return auth.get_user(request)
+
+    key = (str(user_id), backend_path)
+    now = time.monotonic()
+    entry = _user_cache.get(key)
+    if entry is not None and entry[0] > now:
+        user = entry[1]
+        session_hash = request.session.get(HASH_SESSION_KEY)
+        if session_hash and constant_time_compare(session_hash, user.get_session_auth_hash()):
+            # Hand out a copy so a request can't mutate the shared instance.
+            return copy.copy(user)
+    _user_cache.pop(key, None)
+
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        if len(_user_cache) >= MAX_CACHED_USERS:
+            _user_cache.clear()
+        _user_cache[key] = (now + ttl, copy.copy(user))
+    return user
+
+
+def get_user(request):
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = get_cached_user(request)
+    return request._cached_user
+
+
+class CachedUserAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware that resolves request.user through the per-process user cache."""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_user(request))
@@ -0,0 +1,89 @@
+# Generated by Django 4.2.26 on 2026-10-19 03:59
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('todos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='todo',
+            options={'ordering': ['-created_at'], 'verbose_name': 'TODO', 'verbose_name_plural': 'TODOs'},
+        ),
+        migrations.AlterField(
+            model_name='todo',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='created at'),
+        ),
+        migrations.AlterField(
+            model_name='todo',
+            name='description',
+            field=models.TextField(blank=True, verbose_name='description'),
+        ),
+        migrations.AlterField(
+            model_name='todo',
+            name='due_date',
+            field=models.DateField(blank=True, null=True, verbose_name='due date'),
+        ),
+        migrations.AlterField(
+            model_name='todo',
+            name='is_completed',
+            field=models.BooleanField(default=False, verbose_name='is completed'),
+        ),
+        migrations.AlterField(
+            model_name='todo',
+            name='title',
+            field=models.CharField(max_length=200, verbose_name='title'),
+        ),
+        migrations.AlterField(
+            model_name='todo',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='updated at'),
+        ),
+        migrations.AlterField(
+            model_name='todo',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='todos', to=settings.AUTH_USER_MODEL, verbose_name='user'),
+        ),
+        migrations.CreateModel(
+            name='TodoRecurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('frequency', models.CharField(choices=[('DAILY', 'Daily'), ('WEEKLY', 'Weekly'), ('MONTHLY', 'Monthly'), ('YEARLY', 'Yearly')], max_length=7, verbose_name='frequency')),
+                ('interval', models.PositiveSmallIntegerField(default=1, verbose_name='interval')),
+                ('weekdays', models.CharField(blank=True, help_text='Comma-separated weekday numbers (0 = Monday) for weekly rules.', max_length=13, verbose_name='weekdays')),
+                ('count', models.PositiveIntegerField(blank=True, null=True, verbose_name='count')),
+                ('until', models.DateField(blank=True, null=True, verbose_name='until')),
+                ('todo', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='recurrence', to='todos.todo', verbose_name='TODO')),
+            ],
+            options={
+                'verbose_name': 'recurrence',
+                'verbose_name_plural': 'recurrences',
+            },
+        ),
+        migrations.CreateModel(
+            name='OccurrenceCompletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='date')),
+                ('completed_at', models.DateTimeField(auto_now_add=True, verbose_name='completed at')),
+                ('recurrence', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='completions', to='todos.todorecurrence', verbose_name='recurrence')),
+            ],
+            options={
+                'verbose_name': 'completed occurrence',
+                'verbose_name_plural': 'completed occurrences',
+                'ordering': ['date'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='occurrencecompletion',
+            constraint=models.UniqueConstraint(fields=('recurrence', 'date'), name='unique_occurrence_completion'),
+        ),
+    ]
@@ -1,7 +1,13 @@
+from datetime import date
+
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from . import recurrence
+
 
 class Todo(models.Model):
     title = models.CharField(_('title'), max_length=200)
@@ -19,3 +25,162 @@ class Todo(models.Model):
 
     def __str__(self):
         return self.title
+
+
+class TodoRecurrence(models.Model):
+    """
+    Repeat rule for a TODO, starting at its due date. Occurrences are never
+    stored: they are expanded on demand for the requested window, and only
+    completed occurrences get an OccurrenceCompletion row.
+    """
+
+    class Frequency(models.TextChoices):
+        DAILY = recurrence.DAILY, _('Daily')
+        WEEKLY = recurrence.WEEKLY, _('Weekly')
+        MONTHLY = recurrence.MONTHLY, _('Monthly')
+        YEARLY = recurrence.YEARLY, _('Yearly')
+
+    WEEKDAY_CODES = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+
+    todo = models.OneToOneField(Todo, on_delete=models.CASCADE, related_name='recurrence', verbose_name=_('TODO'))
+    frequency = models.CharField(_('frequency'), max_length=7, choices=Frequency.choices)
+    interval = models.PositiveSmallIntegerField(_('interval'), default=1)
+    weekdays = models.CharField(
+        _('weekdays'), max_length=13, blank=True,
+        help_text=_('Comma-separated weekday numbers (0 = Monday) for weekly rules.'),
+    )
+    count = models.PositiveIntegerField(_('count'), null=True, blank=True)
+    until = models.DateField(_('until'), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _('recurrence')
+        verbose_name_plural = _('recurrences')
+
+    def __str__(self):
+        return self.rrule
+
+    @property
+    def weekday_list(self):
+        return [int(weekday) for weekday in self.weekdays.split(',') if weekday.strip()]
+
+    @property
+    def rrule(self):
+        parts = [f'FREQ={self.frequency}', f'INTERVAL={self.interval}']
+        if self.weekday_list:
+            parts.append('BYDAY=' + ','.join(self.WEEKDAY_CODES[weekday] for weekday in self.weekday_list))
+        if self.count:
+            parts.append(f'COUNT={self.count}')
+        if self.until:
+            parts.append(f'UNTIL={self.until:%Y%m%d}')
+        return ';'.join(parts)
+
+    def clean(self):
+        try:
+            weekdays = self.weekday_list
+        except ValueError:
+            weekdays = [-1]
+        if any(weekday not in range(7) for weekday in weekdays):
+            raise ValidationError({'weekdays': _('Use weekday numbers from 0 (Monday) to 6 (Sunday).')})
+        if weekdays and self.frequency != self.Frequency.WEEKLY:
+            raise ValidationError({'weekdays': _('Weekdays can only be set for weekly rules.')})
+
+    def occurrences(self, start, end):
+        """Dates of the occurrences in ``[start, end)``, expanded lazily."""
+        if self.todo.due_date is None:
+            return iter(())
+        return recurrence.expand(
+            self.todo.due_date, self.frequency, start, end,
+            interval=self.interval, weekdays=self.weekday_list,
+            count=self.count, until=self.until,
+        )
+
+    def next_open_occurrence(self, today):
+        """The first occurrence on or after ``today`` that isn't completed, or None once the rule ends."""
+        completed = {completion.date for completion in self.completions.all()}
+        for day in self.occurrences(today, date.max):
+            if day not in completed:
+                return day
+        return None
+
+
+class OccurrenceCompletion(models.Model):
+    """A completed occurrence of a recurring TODO (a sparse exception to its rule)."""
+    recurrence = models.ForeignKey(
+        TodoRecurrence, on_delete=models.CASCADE, related_name='completions', verbose_name=_('recurrence'),
+    )
+    date = models.DateField(_('date'))
+    completed_at = models.DateTimeField(_('completed at'), auto_now_add=True)
+
+    class Meta:
+        ordering = ['date']
+        verbose_name = _('completed occurrence')
+        verbose_name_plural = _('completed occurrences')
+        constraints = [
+            models.UniqueConstraint(fields=['recurrence', 'date'], name='unique_occurrence_completion'),
+        ]
+
+    def __str__(self):
+        return f'{self.recurrence.todo} ({self.date})'
+
+
+class Job(models.Model):
+    """A unit of background work, claimed and run by the ``run_jobs`` worker."""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        RUNNING = 'running', _('Running')
+        DONE = 'done', _('Done')
+        FAILED = 'failed', _('Failed')
+
+    name = models.CharField(_('name'), max_length=100)
+    payload = models.JSONField(_('payload'), default=dict, blank=True)
+    status = models.CharField(_('status'), max_length=7, choices=Status.choices, default=Status.PENDING)
+    run_at = models.DateTimeField(_('run at'), default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(_('attempts'), default=0)
+    max_attempts = models.PositiveSmallIntegerField(_('max attempts'), default=3)
+    locked_by = models.CharField(_('locked by'), max_length=100, blank=True)
+    locked_at = models.DateTimeField(_('locked at'), null=True, blank=True)
+    result = models.JSONField(_('result'), null=True, blank=True)
+    last_error = models.TextField(_('last error'), blank=True)
+    created_at = models.DateTimeField(_('created at'), auto_now_add=True)
+    finished_at = models.DateTimeField(_('finished at'), null=True, blank=True)
+
+    class Meta:
+        ordering = ['run_at', 'pk']
+        verbose_name = _('job')
+        verbose_name_plural = _('jobs')
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='todos_job_status_run_at'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} ({self.get_status_display()})'
+
+
+class ArchivedTodo(models.Model):
+    """
+    A completed one-off TODO moved out of the hot ``todos_todo`` table by
+    ``todos.archive.archive_completed_todos``. Read-only history.
+    """
+    original_id = models.BigIntegerField(_('original ID'), unique=True)
+    title = models.CharField(_('title'), max_length=200)
+    description = models.TextField(_('description'), blank=True)
+    due_date = models.DateField(_('due date'), null=True, blank=True)
+    created_at = models.DateTimeField(_('created at'))
+    updated_at = models.DateTimeField(_('updated at'))
+    archived_at = models.DateTimeField(_('archived at'), auto_now_add=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_todos', verbose_name=_('user'))
+
+    # Archived TODOs are always completed; lets templates treat them like Todo.
+    is_completed = True
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = _('archived TODO')
+        verbose_name_plural = _('archived TODOs')
+        indexes = [
+            models.Index(fields=['user', 'due_date'], name='todos_archived_user_due'),
+        ]
+
+    def __str__(self):
+        return self.title
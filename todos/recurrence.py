@@ -0,0 +1,95 @@
+"""
+Lazy expansion of RRULE-style recurrence rules.
+
+Only the subset the app needs is supported: FREQ=DAILY/WEEKLY/MONTHLY/YEARLY
+with INTERVAL, BYDAY (weekly rules only), COUNT and UNTIL. As in RFC 5545,
+dates that don't exist in a period (e.g. the 31st in April) are skipped
+rather than moved, and don't count towards COUNT.
+"""
+import calendar
+from datetime import MAXYEAR, date, timedelta
+
+DAILY = 'DAILY'
+WEEKLY = 'WEEKLY'
+MONTHLY = 'MONTHLY'
+YEARLY = 'YEARLY'
+
+# Periods past date.max can't be represented: expansion stops there.
+_MAX_ORDINAL = date.max.toordinal()
+
+
+def _period(anchor, frequency, interval, weekdays, index):
+    """Return (first day of the index-th period, occurrence dates in it)."""
+    if frequency == DAILY:
+        ordinal = anchor.toordinal() + index * interval
+        if ordinal > _MAX_ORDINAL:
+            return None, []
+        day = date.fromordinal(ordinal)
+        return day, [day]
+
+    if frequency == WEEKLY:
+        week_start = anchor.toordinal() - anchor.weekday() + 7 * index * interval
+        if week_start > _MAX_ORDINAL:
+            return None, []
+        ordinals = [week_start + weekday for weekday in weekdays or [anchor.weekday()]]
+        days = [date.fromordinal(ordinal) for ordinal in ordinals if ordinal <= _MAX_ORDINAL]
+        return date.fromordinal(week_start), [day for day in days if day >= anchor]
+
+    if frequency == MONTHLY:
+        year, month = divmod(anchor.year * 12 + anchor.month - 1 + index * interval, 12)
+        month += 1
+        if year > MAXYEAR:
+            return None, []
+        days = [date(year, month, anchor.day)] if anchor.day <= calendar.monthrange(year, month)[1] else []
+        return date(year, month, 1), days
+
+    if frequency == YEARLY:
+        year = anchor.year + index * interval
+        if year > MAXYEAR:
+            return None, []
+        valid = anchor.day <= calendar.monthrange(year, anchor.month)[1]
+        return date(year, 1, 1), [date(year, anchor.month, anchor.day)] if valid else []
+
+    raise ValueError(f'Unsupported frequency {frequency!r}')
+
+
+def _first_period(anchor, frequency, interval, start):
+    """Index of the first period that can contain ``start``."""
+    if start <= anchor:
+        return 0
+    if frequency == DAILY:
+        return (start - anchor).days // interval
+    if frequency == WEEKLY:
+        week_start = anchor - timedelta(days=anchor.weekday())
+        return (start - week_start).days // (7 * interval)
+    if frequency == MONTHLY:
+        return ((start.year - anchor.year) * 12 + start.month - anchor.month) // interval
+    return (start.year - anchor.year) // interval
+
+
+def expand(anchor, frequency, start, end, interval=1, weekdays=(), count=None, until=None):
+    """
+    Yield the occurrence dates of a rule starting at ``anchor`` that fall in
+    ``[start, end)``, in order.
+
+    Only the periods overlapping the window are generated, unless the rule has
+    a COUNT, in which case earlier occurrences have to be counted too.
+    """
+    interval = max(1, interval)
+    weekdays = sorted(set(weekdays))
+    index = 0 if count else _first_period(anchor, frequency, interval, start)
+    seen = 0
+
+    while True:
+        period_start, days = _period(anchor, frequency, interval, weekdays, index)
+        if period_start is None or period_start >= end or (until and period_start > until):
+            return
+        for day in days:
+            if day >= end or (until and day > until):
+                return
+            seen += 1
+            if count and seen > count:
+                return
+            if day >= start:
+                yield day
+        index += 1
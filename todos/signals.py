@@ -0,0 +1,27 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hashers, get_hashers_by_algorithm
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .middleware import clear_user_cache
+from .throttling import calendar_api_bucket
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def evict_cached_user(sender, instance, **kwargs):
+    clear_user_cache(instance.pk)
+
+
+@receiver(setting_changed)
+def reset_tuned_hashers(setting, **kwargs):
+    if setting == 'TODOS_PASSWORD_HASHER_PARAMS':
+        get_hashers.cache_clear()
+        get_hashers_by_algorithm.cache_clear()
+
+
+@receiver(setting_changed)
+def reset_rate_limits(setting, **kwargs):
+    if setting in ('TODOS_CALENDAR_API_RATE', 'TODOS_CALENDAR_API_BURST'):
+        calendar_api_bucket.reset()
@@ -0,0 +1,20 @@
+"""
+Test runner that keeps the per-request access log out of the test output.
+"""
+import logging
+
+from django.test.runner import DiscoverRunner
+
+
+class TodosTestRunner(DiscoverRunner):
+    """``DiscoverRunner`` that raises ``todos.access`` to WARNING; tests opt back in with ``assertLogs``."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        logger = logging.getLogger('todos.access')
+        self.saved_access_level = logger.level
+        logger.setLevel(logging.WARNING)
+
+    def teardown_test_environment(self, **kwargs):
+        logging.getLogger('todos.access').setLevel(self.saved_access_level)
+        super().teardown_test_environment(**kwargs)
@@ -1,12 +1,36 @@
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
+from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.hashers import get_hasher, make_password
 from django.contrib.auth.models import User
-from django.urls import reverse
-from django.utils.translation import activate
+from django.contrib.sessions.backends import cached_db
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.urls import NoReverseMatch, reverse
+from django.utils import timezone
+from django.utils.translation import activate, override as override_language, trans_real
 from django.conf import settings
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
+from io import StringIO
+import copy
 import json
-from .models import Todo
-from .forms import TodoForm, UserRegistrationForm
+import logging
+import logging.config
+import os
+import subprocess
+import sys
+import threading
+from todo_project.env import cache_from_url, env_choice, require_shared_cache
+from . import jobs
+from .access_log import BackgroundHandler, JsonFormatter
+from .archive import archive_completed_todos
+from .i18n import preload_translations
+from .management.commands.loadtest import VirtualUser
+from .middleware import _user_cache, clear_user_cache
+from .models import ArchivedTodo, Job, OccurrenceCompletion, Todo, TodoRecurrence
+from .forms import INPUT_CLASS, TodoForm, UserRegistrationForm
+from .recurrence import expand
+from .throttling import SingleFlight
 
 
 class TodoModelTest(TestCase):
@@ -396,3 +420,800 @@ class CalendarViewTest(TestCase):
         self.assertContains(response, 'Active')
         self.assertContains(response, 'Completed')
         self.assertContains(response, 'Overdue')
+
+
+class TranslationPreloadTest(TestCase):
+    """Test preloading of the gettext catalogs"""
+
+    def test_preload_loads_all_configured_languages(self):
+        """Test that every language in LANGUAGES ends up in the translation cache"""
+        loaded = preload_translations()
+        self.assertEqual(loaded, [code for code, name in settings.LANGUAGES])
+        for code in loaded:
+            self.assertIn(code, trans_real._translations)
+
+    def test_preload_skips_unsupported_languages(self):
+        """Test that unknown language codes are ignored"""
+        self.assertEqual(preload_translations(['de', 'xx']), ['de'])
+
+
+class FormRenderingTest(TestCase):
+    """Test class-level widget attrs"""
+
+    def test_password_fields_styled_on_class(self):
+        """Test that password labels and attrs are resolved once on the class"""
+        fields = UserRegistrationForm.base_fields
+        self.assertEqual(fields['password1'].widget.attrs['class'], INPUT_CLASS)
+        self.assertEqual(fields['password2'].widget.attrs['class'], INPUT_CLASS)
+        self.assertEqual(str(fields['password1'].label), 'Password')
+        self.assertEqual(str(fields['password2'].label), 'Confirm Password')
+        self.assertIn('class="' + INPUT_CLASS, str(UserRegistrationForm()['password1']))
+
+    def test_parent_form_fields_untouched(self):
+        """Test that styling doesn't leak into Django's UserCreationForm"""
+        self.assertNotIn('class', UserCreationForm.base_fields['password1'].widget.attrs)
+        self.assertNotIn('placeholder', UserCreationForm.base_fields['password2'].widget.attrs)
+
+
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+class CachedUserSessionTest(TestCase):
+    """Test the cached session store and the per-process user cache"""
+
+    def setUp(self):
+        clear_user_cache()
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        Todo.objects.create(title='Cached TODO', user=self.user)
+        self.client.login(username='testuser', password='testpass123')
+
+    def test_repeat_request_skips_session_and_user_queries(self):
+        """Test that a warm request only queries the todos table"""
+        url = reverse('todo_calendar_api')
+        self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(len(json.loads(response.content)), 1)
+
+    def test_user_cache_evicted_on_save(self):
+        """Test that saving a user drops it from the cache"""
+        self.client.get(reverse('todo_list'))
+        self.user.first_name = 'Changed'
+        self.user.save()
+        with self.assertNumQueries(2):
+            self.client.get(reverse('todo_calendar_api'))
+
+    def test_password_change_elsewhere_applies_after_ttl(self):
+        """Test that a password changed by another process logs out once the entry expires"""
+        self.client.get(reverse('todo_list'))
+        # Another process changes the password: no signal reaches this cache.
+        User.objects.filter(pk=self.user.pk).update(password='changed')
+        for key, (expires_at, user) in list(_user_cache.items()):
+            _user_cache[key] = (0, user)
+        response = self.client.get(reverse('todo_list'))
+        self.assertEqual(response.status_code, 302)
+
+    @override_settings(TODOS_USER_CACHE_TTL=0)
+    def test_cache_disabled_loads_user_every_request(self):
+        """Test that a zero TTL falls back to Django's get_user"""
+        url = reverse('todo_calendar_api')
+        self.client.get(url)
+        with self.assertNumQueries(2):
+            self.client.get(url)
+
+
+class PasswordHasherProfileTest(TestCase):
+    """Test the settings-driven password hasher cost and rehash on login"""
+
+    @override_settings(TODOS_PASSWORD_HASHER_PARAMS={'pbkdf2': {'iterations': 1000}})
+    def test_hasher_uses_configured_cost(self):
+        """Test that new hashes use the iterations from settings"""
+        self.assertTrue(make_password('testpass123').startswith('pbkdf2_sha256$1000$'))
+
+    def test_login_rehashes_with_new_cost(self):
+        """Test that logging in upgrades a hash made with an outdated cost"""
+        with override_settings(TODOS_PASSWORD_HASHER_PARAMS={'pbkdf2': {'iterations': 1000}}):
+            user = User.objects.create_user(username='testuser', password='testpass123')
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$1000$'))
+
+        with override_settings(TODOS_PASSWORD_HASHER_PARAMS={'pbkdf2': {'iterations': 2000}}):
+            response = self.client.post(reverse('login'), {
+                'username': 'testuser',
+                'password': 'testpass123'
+            })
+        self.assertEqual(response.status_code, 302)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$2000$'))
+
+    @override_settings(
+        PASSWORD_HASHERS=['todos.hashers.TunedScryptPasswordHasher', 'todos.hashers.TunedPBKDF2PasswordHasher'],
+        TODOS_PASSWORD_HASHER_PARAMS={'scrypt': {'work_factor': 2 ** 10}},
+    )
+    def test_login_migrates_to_preferred_hasher(self):
+        """Test that switching the profile moves users to the new algorithm on login"""
+        user = User.objects.create(
+            username='testuser',
+            password=make_password('testpass123', hasher='pbkdf2_sha256'),
+        )
+        self.assertTrue(self.client.login(username='testuser', password='testpass123'))
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('scrypt$1024$'))
+
+    @override_settings(TODOS_PASSWORD_HASHER_PARAMS={'pbkdf2': {'rounds': 10}})
+    def test_unknown_parameter_rejected(self):
+        """Test that misspelled cost parameters fail loudly"""
+        with self.assertRaises(ImproperlyConfigured):
+            get_hasher('default')
+
+
+class WorkerRoleTest(TestCase):
+    """Test the per-role settings split (TODO_ROLE)"""
+
+    def test_roles_pass_system_checks(self):
+        """Test that every trimmed role boots and passes the system checks"""
+        for role in ['web', 'api', 'admin']:
+            with self.subTest(role=role):
+                result = subprocess.run(
+                    [sys.executable, 'manage.py', 'check'],
+                    cwd=settings.BASE_DIR, capture_output=True, text=True,
+                    env={**os.environ, 'TODO_ROLE': role},
+                )
+                self.assertEqual(result.returncode, 0, result.stderr)
+
+    @override_settings(ROOT_URLCONF='todo_project.urls_api')
+    def test_api_role_routes_only_api(self):
+        """Test that the api URLconf serves the calendar API and nothing else"""
+        User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        response = self.client.get('/en/api/calendar/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get('/en/').status_code, 404)
+        with self.assertRaises(NoReverseMatch):
+            reverse('todo_list')
+
+    @override_settings(ROOT_URLCONF='todo_project.urls_api')
+    def test_api_role_rejects_anonymous_with_401(self):
+        """Test that anonymous API calls get JSON 401 rather than a redirect to an unrouted login page"""
+        response = self.client.get('/de/api/calendar/')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(json.loads(response.content), {'detail': 'Anmeldung erforderlich.'})
+
+    def test_admin_role_logs_out_to_admin_login(self):
+        """Test that admin role logouts land on the admin login page rather than the unrouted /login/"""
+        login_url, login_redirect_url, logout_redirect_url = settings.ROLE_AUTH_URLS['admin']
+        with override_settings(ROOT_URLCONF='todo_project.urls_admin', LOGIN_URL=login_url,
+                               LOGIN_REDIRECT_URL=login_redirect_url, LOGOUT_REDIRECT_URL=logout_redirect_url):
+            User.objects.create_superuser(username='admin', password='testpass123')
+            self.client.login(username='admin', password='testpass123')
+            response = self.client.post('/en/admin/logout/')
+            self.assertRedirects(response, '/en/admin/login/')
+
+    def test_web_role_skips_admin_imports(self):
+        """Test that the web role never imports the admin site"""
+        script = (
+            'import sys, django; django.setup(); '
+            'from django.urls import resolve; resolve("/en/"); '
+            'print("django.contrib.admin.sites" in sys.modules)'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', script], cwd=settings.BASE_DIR, capture_output=True, text=True,
+            env={**os.environ, 'TODO_ROLE': 'web', 'DJANGO_SETTINGS_MODULE': 'todo_project.settings'},
+        )
+        self.assertEqual(result.stdout.strip(), 'False', result.stderr)
+
+
+class RecurrenceExpansionTest(TestCase):
+    """Test lazy expansion of recurrence rules"""
+
+    def test_weekly_rule_with_weekdays(self):
+        """Test that BYDAY-style weekdays expand within the window only"""
+        days = list(expand(date(2024, 1, 3), 'WEEKLY', date(2024, 3, 1), date(2024, 3, 12), weekdays=[0, 2]))
+        self.assertEqual(days, [date(2024, 3, 4), date(2024, 3, 6), date(2024, 3, 11)])
+
+    def test_monthly_rule_skips_missing_days(self):
+        """Test that the 31st is skipped in shorter months"""
+        days = list(expand(date(2024, 1, 31), 'MONTHLY', date(2024, 1, 1), date(2024, 6, 1)))
+        self.assertEqual(days, [date(2024, 1, 31), date(2024, 3, 31), date(2024, 5, 31)])
+
+    def test_count_and_until_limit_occurrences(self):
+        """Test that COUNT counts from the start of the rule and UNTIL is inclusive"""
+        days = list(expand(date(2024, 1, 1), 'DAILY', date(2024, 1, 3), date(2025, 1, 1), count=4))
+        self.assertEqual(days, [date(2024, 1, 3), date(2024, 1, 4)])
+        days = list(expand(date(2024, 1, 1), 'DAILY', date(2024, 1, 1), date(2025, 1, 1),
+                           interval=7, until=date(2024, 1, 15)))
+        self.assertEqual(days, [date(2024, 1, 1), date(2024, 1, 8), date(2024, 1, 15)])
+
+    def test_far_window_does_not_expand_history(self):
+        """Test that an open-ended rule jumps straight to the requested window"""
+        days = list(expand(date(2000, 1, 1), 'DAILY', date(2999, 1, 1), date(2999, 1, 3)))
+        self.assertEqual(days, [date(2999, 1, 1), date(2999, 1, 2)])
+
+    def test_expansion_stops_at_date_max(self):
+        """Test that rules end quietly at the last representable date"""
+        end = date.max
+        self.assertEqual(list(expand(date(2024, 1, 1), 'DAILY', date(9999, 12, 30), end)), [date(9999, 12, 30)])
+        weekly = list(expand(date(2024, 1, 5), 'WEEKLY', date(9999, 12, 20), end, weekdays=[4, 5, 6]))
+        self.assertEqual(weekly[-1], date(9999, 12, 26))
+        self.assertEqual(list(expand(date(2024, 1, 31), 'MONTHLY', date(9999, 12, 1), end)), [])
+
+
+class RecurringTodoTest(TestCase):
+    """Test recurring TODOs in the form, calendar API and toggle view"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        self.todo = Todo.objects.create(title='Weekly TODO', due_date=date(2024, 1, 1), user=self.user)
+        self.rule = TodoRecurrence.objects.create(todo=self.todo, frequency='WEEKLY')
+
+    def get_events(self, start, end):
+        response = self.client.get(reverse('todo_calendar_api'), {
+            'start': f'{start.isoformat()}T00:00:00+01:00',
+            'end': f'{end.isoformat()}T00:00:00+01:00',
+        })
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)
+
+    def test_calendar_expands_only_requested_window(self):
+        """Test that one row yields one event per week in the window"""
+        events = self.get_events(date(2024, 1, 29), date(2024, 3, 11))
+        self.assertEqual([event['start'] for event in events], [
+            '2024-01-29', '2024-02-05', '2024-02-12', '2024-02-19',
+            '2024-02-26', '2024-03-04',
+        ])
+        self.assertTrue(all(event['id'] == self.todo.pk for event in events))
+        self.assertEqual(events[0]['extendedProps']['rrule'], 'FREQ=WEEKLY;INTERVAL=1')
+        self.assertEqual(Todo.objects.count(), 1)
+
+    def test_window_filters_one_off_todos(self):
+        """Test that non-recurring TODOs outside the window are left out"""
+        Todo.objects.create(title='Inside', due_date=date(2024, 2, 10), user=self.user)
+        Todo.objects.create(title='Outside', due_date=date(2024, 6, 10), user=self.user)
+        titles = {event['title'] for event in self.get_events(date(2024, 2, 1), date(2024, 3, 1))}
+        self.assertEqual(titles, {'Weekly TODO', 'Inside'})
+
+    def test_invalid_window_rejected(self):
+        """Test that a malformed window is a bad request"""
+        response = self.client.get(reverse('todo_calendar_api'), {'start': 'soon', 'end': 'later'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_too_wide_window_rejected(self):
+        """Test that windows over MAX_CALENDAR_DAYS are refused before expanding anything"""
+        response = self.client.get(reverse('todo_calendar_api'), {'start': '2024-01-01', 'end': '9999-12-31'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_window_at_end_of_calendar(self):
+        """Test that a window ending near date.max doesn't overflow"""
+        events = self.get_events(date(9999, 12, 1), date(9999, 12, 31))
+        self.assertEqual(events[-1]['start'], '9999-12-27')
+
+    def test_list_toggle_completes_next_occurrence(self):
+        """Test that the list checkbox completes one occurrence, not the series"""
+        today = date.today()
+        rule_todo = Todo.objects.create(title='Daily', due_date=today - timedelta(days=3), user=self.user)
+        TodoRecurrence.objects.create(todo=rule_todo, frequency='DAILY')
+        OccurrenceCompletion.objects.create(recurrence=rule_todo.recurrence, date=today)
+
+        response = self.client.get(reverse('todo_list'))
+        self.assertContains(response, f'name="date" value="{today + timedelta(days=1):%Y-%m-%d}"')
+
+        self.client.post(reverse('todo_toggle', args=[rule_todo.pk]))
+        rule_todo.refresh_from_db()
+        self.assertFalse(rule_todo.is_completed)
+        self.assertEqual(
+            sorted(OccurrenceCompletion.objects.filter(recurrence__todo=rule_todo).values_list('date', flat=True)),
+            [today, today + timedelta(days=1)],
+        )
+
+    def test_list_toggle_completes_ended_series(self):
+        """Test that a rule without further occurrences is completed as a whole"""
+        TodoRecurrence.objects.filter(pk=self.rule.pk).update(until=date(2024, 1, 31))
+        self.client.post(reverse('todo_toggle', args=[self.todo.pk]))
+        self.todo.refresh_from_db()
+        self.assertTrue(self.todo.is_completed)
+
+    def test_edit_form_reads_selected_recurrence(self):
+        """Test that the form takes its initial repeat value without a query of its own"""
+        todo = Todo.objects.select_related('recurrence').get(pk=self.todo.pk)
+        with self.assertNumQueries(0):
+            form = TodoForm(instance=todo)
+        self.assertEqual(form.fields['repeat'].initial, 'WEEKLY')
+
+    def test_toggle_occurrence_stores_sparse_completion(self):
+        """Test that completing one occurrence adds a single exception row"""
+        url = reverse('todo_toggle', args=[self.todo.pk])
+        response = self.client.post(url, {'date': '2024-02-05'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(OccurrenceCompletion.objects.get().date, date(2024, 2, 5))
+
+        events = {e['start']: e for e in self.get_events(date(2024, 2, 1), date(2024, 2, 15))}
+        self.assertTrue(events['2024-02-05']['extendedProps']['is_completed'])
+        self.assertEqual(events['2024-02-05']['color'], '#10B981')
+        self.assertFalse(events['2024-02-12']['extendedProps']['is_completed'])
+
+        self.client.post(url, {'date': '2024-02-05'})
+        self.assertFalse(OccurrenceCompletion.objects.exists())
+        self.todo.refresh_from_db()
+        self.assertFalse(self.todo.is_completed)
+
+    def test_toggle_rejects_dates_off_the_rule(self):
+        """Test that only real occurrences can be completed"""
+        response = self.client.post(reverse('todo_toggle', args=[self.todo.pk]), {'date': '2024-02-06'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_form_creates_and_removes_rule(self):
+        """Test that the Repeat field manages the recurrence rule"""
+        response = self.client.post(reverse('todo_create'), {
+            'title': 'Daily TODO',
+            'due_date': date.today(),
+            'repeat': 'DAILY',
+        })
+        self.assertEqual(response.status_code, 302)
+        todo = Todo.objects.get(title='Daily TODO')
+        self.assertEqual(todo.recurrence.frequency, 'DAILY')
+
+        self.client.post(reverse('todo_update', args=[todo.pk]), {'title': 'Daily TODO', 'due_date': date.today()})
+        self.assertFalse(TodoRecurrence.objects.filter(todo=todo).exists())
+
+    def test_repeat_strings_translated(self):
+        """Test that the new form and list strings are in the catalogs"""
+        with override_language('de'):
+            response = self.client.get(reverse('todo_create'))
+        self.assertContains(response, 'Wiederholen')
+        self.assertContains(response, 'Keine Wiederholung')
+        self.assertContains(response, 'Wöchentlich')
+
+    def test_form_requires_due_date_to_repeat(self):
+        """Test that a repeating TODO needs a start date"""
+        form = TodoForm(data={'title': 'No start', 'repeat': 'WEEKLY'})
+        self.assertFalse(form.is_valid())
+        self.assertIn('due_date', form.errors)
+
+
+class JobQueueTest(TestCase):
+    """Test the database-backed job queue and the shipped maintenance jobs"""
+
+    def setUp(self):
+        self.jobs = jobs
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.calls = []
+        jobs.registry['test_job'] = lambda **kwargs: self.calls.append(kwargs) or len(self.calls)
+        self.addCleanup(jobs.registry.pop, 'test_job')
+
+    def test_enqueue_and_run(self):
+        """Test that a queued job runs once with its payload"""
+        job = self.jobs.enqueue('test_job', answer=42)
+        self.assertEqual(self.jobs.run_pending(), 1)
+        self.assertEqual(self.calls, [{'answer': 42}])
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.DONE)
+        self.assertEqual(job.result, 1)
+        self.assertEqual(self.jobs.run_pending(), 0)
+
+    def test_claimed_job_not_claimed_twice(self):
+        """Test that a second worker can't claim a job that is already running"""
+        self.jobs.enqueue('test_job')
+        self.assertIsNotNone(self.jobs.claim_next('worker-1'))
+        self.assertIsNone(self.jobs.claim_next('worker-2'))
+
+    def test_future_jobs_wait(self):
+        """Test that jobs scheduled later are not run yet"""
+        self.jobs.enqueue('test_job', run_at=timezone.now() + timedelta(hours=1))
+        self.assertEqual(self.jobs.run_pending(), 0)
+
+    def test_failed_job_retried_then_marked_failed(self):
+        """Test retry with backoff and the final FAILED state"""
+        def broken():
+            raise RuntimeError('boom')
+
+        self.jobs.registry['test_job'] = broken
+        job = self.jobs.enqueue('test_job', max_attempts=2)
+        with self.assertLogs('todos.jobs', 'ERROR'):
+            self.jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.PENDING)
+        self.assertIn('boom', job.last_error)
+
+        Job.objects.filter(pk=job.pk).update(run_at=job.created_at)
+        with self.assertLogs('todos.jobs', 'ERROR'):
+            self.jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_stale_running_job_requeued(self):
+        """Test that jobs left running by a dead worker go back to the queue"""
+        job = self.jobs.enqueue('test_job')
+        self.jobs.claim_next('dead-worker')
+        Job.objects.filter(pk=job.pk).update(locked_at=job.created_at - timedelta(hours=2))
+        self.assertEqual(self.jobs.requeue_stale(timedelta(hours=1)), 1)
+        self.assertEqual(self.jobs.run_pending(), 1)
+
+    def test_purge_archived_todos_in_batches(self):
+        """Test that only archive rows older than the cutoff are deleted"""
+        for i in range(5):
+            Todo.objects.create(title=f'Old {i}', is_completed=True, user=self.user)
+        Todo.objects.create(title='Recent', is_completed=True, user=self.user)
+        Todo.objects.update(updated_at=timezone.now() - timedelta(days=400))
+        archive_completed_todos()
+        ArchivedTodo.objects.exclude(title='Recent').update(archived_at=timezone.now() - timedelta(days=40))
+
+        self.assertEqual(self.jobs.purge_archived_todos(), 0)
+        self.assertEqual(self.jobs.purge_archived_todos(older_than_days=30, batch_size=2), 5)
+        self.assertEqual(list(ArchivedTodo.objects.values_list('title', flat=True)), ['Recent'])
+
+
+class ArchiveTest(TestCase):
+    """Test archiving of old completed TODOs and the include-archived toggle"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        old = timezone.now() - timedelta(days=200)
+        self.old_done = Todo.objects.create(
+            title='Old done', due_date=date(2024, 2, 10), is_completed=True, user=self.user
+        )
+        weekly = Todo.objects.create(title='Old weekly', due_date=date(2024, 1, 1), is_completed=True, user=self.user)
+        TodoRecurrence.objects.create(todo=weekly, frequency='WEEKLY')
+        Todo.objects.create(title='Old open', user=self.user)
+        Todo.objects.update(updated_at=old)
+        Todo.objects.create(title='Recent done', is_completed=True, user=self.user)
+
+    def test_archive_moves_old_completed_in_batches(self):
+        """Test that only old completed one-off TODOs move, keeping their data"""
+        Todo.objects.create(title='Old undated', is_completed=True, user=self.user)
+        Todo.objects.filter(title='Old undated').update(updated_at=timezone.now() - timedelta(days=200))
+        self.assertEqual(archive_completed_todos(batch_size=1), 2)
+        self.assertEqual(
+            set(Todo.objects.values_list('title', flat=True)), {'Old weekly', 'Old open', 'Recent done'}
+        )
+        archived = ArchivedTodo.objects.get(original_id=self.old_done.pk)
+        self.assertEqual(archived.title, 'Old done')
+        self.assertEqual(archived.due_date, date(2024, 2, 10))
+        self.assertEqual(archived.user, self.user)
+        self.assertEqual(archive_completed_todos(), 0)
+
+    def test_recurring_todos_keep_completion_history(self):
+        """Test that recurring TODOs aren't archived, so their completions survive"""
+        weekly = Todo.objects.get(title='Old weekly')
+        OccurrenceCompletion.objects.create(recurrence=weekly.recurrence, date=date(2024, 1, 8))
+        archive_completed_todos()
+        self.assertTrue(Todo.objects.filter(pk=weekly.pk).exists())
+        self.assertEqual(OccurrenceCompletion.objects.count(), 1)
+
+    def test_archive_job_registered(self):
+        """Test that archiving can run through the job queue"""
+        jobs.enqueue('archive_completed_todos', older_than_days=30)
+        jobs.run_pending()
+        self.assertEqual(ArchivedTodo.objects.count(), 1)
+
+    def test_list_view_archive_toggle(self):
+        """Test that archived TODOs are only listed when asked for"""
+        archive_completed_todos()
+        response = self.client.get(reverse('todo_list'))
+        self.assertNotContains(response, 'Old done')
+        self.assertContains(response, '?archived=1')
+        response = self.client.get(reverse('todo_list'), {'archived': '1'})
+        self.assertContains(response, 'Old done')
+        self.assertContains(response, 'Hide archived')
+        with override_language('de'):
+            response = self.client.get(reverse('todo_list'), {'archived': '1'})
+        self.assertContains(response, 'Archivierte ausblenden')
+
+    def test_calendar_api_archive_toggle(self):
+        """Test that the calendar API includes archived TODOs on request"""
+        archive_completed_todos()
+        params = {'start': '2024-02-01', 'end': '2024-03-01'}
+        response = self.client.get(reverse('todo_calendar_api'), params)
+        self.assertNotIn('Old done', [event['title'] for event in json.loads(response.content)])
+
+        response = self.client.get(reverse('todo_calendar_api'), {**params, 'archived': '1'})
+        events = [event for event in json.loads(response.content) if event['title'] == 'Old done']
+        self.assertEqual(len(events), 1)
+        self.assertTrue(events[0]['extendedProps']['archived'])
+        self.assertEqual(events[0]['color'], '#10B981')
+
+    def test_calendar_api_places_undated_archived_on_last_update(self):
+        """Test that archived TODOs without a due date appear on the same day with and without a window"""
+        undated = Todo.objects.create(title='Undated', is_completed=True, user=self.user)
+        Todo.objects.filter(pk=undated.pk).update(updated_at=timezone.make_aware(datetime(2024, 2, 20, 12)))
+        archive_completed_todos()
+
+        response = self.client.get(reverse('todo_calendar_api'), {'archived': '1'})
+        unfiltered = [event['start'] for event in json.loads(response.content) if event['title'] == 'Undated']
+        self.assertEqual(unfiltered, ['2024-02-20'])
+        for start, end, expected in [('2024-02-01', '2024-03-01', ['2024-02-20']), ('2024-03-01', '2024-04-01', [])]:
+            response = self.client.get(reverse('todo_calendar_api'), {'start': start, 'end': end, 'archived': '1'})
+            events = [event['start'] for event in json.loads(response.content) if event['title'] == 'Undated']
+            self.assertEqual(events, expected)
+
+
+class GenerateDataTest(TestCase):
+    """Test the synthetic data generator"""
+
+    def test_generates_users_and_todos(self):
+        """Test that users and TODOs follow the requested distribution"""
+        call_command(
+            'generate_data', users=3, todos_per_user=10, todos_spread=0, completion_ratio=1,
+            no_due_ratio=0, due_spread=5, recurring_ratio=1, description_length=0, seed=1,
+            stdout=StringIO(),
+        )
+        users = User.objects.filter(username__startswith='loaduser')
+        self.assertEqual(users.count(), 3)
+        self.assertEqual(Todo.objects.count(), 30)
+        self.assertFalse(Todo.objects.filter(is_completed=False).exists())
+        self.assertFalse(Todo.objects.exclude(description='').exists())
+        self.assertFalse(Todo.objects.filter(due_date__gt=date.today() + timedelta(days=5)).exists())
+        self.assertEqual(TodoRecurrence.objects.count(), 30)
+        self.assertTrue(self.client.login(username='loaduser0', password='loadtest-pass-123'))
+
+    def test_appends_after_existing_users(self):
+        """Test that running twice creates new accounts instead of clashing"""
+        call_command('generate_data', users=2, todos_per_user=0, stdout=StringIO())
+        call_command('generate_data', users=2, todos_per_user=0, stdout=StringIO())
+        self.assertEqual(
+            sorted(User.objects.values_list('username', flat=True)),
+            ['loaduser0', 'loaduser1', 'loaduser2', 'loaduser3'],
+        )
+
+    def test_numbering_continues_after_highest_suffix(self):
+        """Test that gaps and non-numeric names do not cause username clashes"""
+        call_command('generate_data', users=3, todos_per_user=0, stdout=StringIO())
+        User.objects.filter(username='loaduser1').delete()
+        User.objects.create_user(username='loaduserX')
+        call_command('generate_data', users=2, todos_per_user=0, stdout=StringIO())
+        self.assertEqual(
+            sorted(User.objects.values_list('username', flat=True)),
+            ['loaduser0', 'loaduser2', 'loaduser3', 'loaduser4', 'loaduserX'],
+        )
+
+
+class LoadTestVirtualUserTest(TestCase):
+    """Test the load-test client without a running server"""
+
+    class StubUser(VirtualUser):
+        def __init__(self, responses):
+            super().__init__('http://testserver', 'en', 'loaduser0', 'pw', None)
+            self.responses = list(responses)
+
+        def request(self, path, data=None):
+            return self.responses.pop(0)
+
+    def test_calendar_api_ignores_non_200_bodies(self):
+        """Test that a rate-limited answer keeps the known ids instead of failing to parse"""
+        user = self.StubUser([
+            (200, b'[{"id": 3}, {"id": "a-1"}, {"id": 1}]'),
+            (429, b'Too many requests.'),
+        ])
+        self.assertEqual(user.calendar_api(), 200)
+        self.assertEqual(user.todo_ids, [1, 3])
+        self.assertEqual(user.calendar_api(), 429)
+        self.assertEqual(user.todo_ids, [1, 3])
+
+
+class CalendarApiThrottlingTest(TestCase):
+    """Test rate limiting and request coalescing of the calendar API"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client = Client()
+        self.client.login(username='testuser', password='testpass123')
+        activate('en')
+
+    @override_settings(TODOS_CALENDAR_API_RATE=0.01, TODOS_CALENDAR_API_BURST=2)
+    def test_rate_limit_per_user(self):
+        """Test that a user gets 429 with Retry-After once the burst is used up"""
+        url = reverse('todo_calendar_api')
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 1)
+
+        User.objects.create_user(username='other', password='testpass123')
+        other = Client()
+        other.login(username='other', password='testpass123')
+        self.assertEqual(other.get(url).status_code, 200)
+
+    @override_settings(TODOS_CALENDAR_API_RATE=0.01, TODOS_CALENDAR_API_BURST=1)
+    def test_rate_limit_message_is_translated(self):
+        """Test that the 429 body follows the active language"""
+        with override_language('de'):
+            url = reverse('todo_calendar_api')
+        self.client.get(url)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.content.decode(), 'Zu viele Anfragen.')
+
+    @override_settings(TODOS_CALENDAR_API_RATE=0, TODOS_CALENDAR_API_BURST=1)
+    def test_rate_limit_disabled(self):
+        """Test that a zero rate disables the limit"""
+        url = reverse('todo_calendar_api')
+        for _ in range(5):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_single_flight_shares_result(self):
+        """Test that concurrent calls with the same key run the function once"""
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls, results = [], []
+
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return b'payload'
+
+        def call():
+            results.append(flight.do('key', slow))
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=call) for _ in range(3)]
+        for thread in followers:
+            thread.start()
+        for thread in followers:
+            thread.join(0.2)
+            self.assertTrue(thread.is_alive())
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [b'payload'] * 4)
+        self.assertEqual(flight.do('key', lambda: b'fresh'), b'fresh')
+
+    def test_single_flight_propagates_errors(self):
+        """Test that an exception reaches the caller and isn't kept"""
+        flight = SingleFlight()
+        with self.assertRaises(ValueError):
+            flight.do('key', lambda: int('x'))
+        self.assertEqual(flight.do('key', lambda: 1), 1)
+
+
+class AccessLogTest(TestCase):
+    """Test the structured access log"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client = Client()
+        self.client.login(username='testuser', password='testpass123')
+        activate('en')
+
+    @override_settings(TODOS_ACCESS_LOG_SAMPLE_RATE=1, TODOS_SLOW_REQUEST_MS=10000)
+    def test_logs_view_user_status_and_queries(self):
+        """Test that a sampled request is logged with its view, user and query count"""
+        with self.assertLogs('todos.access', 'INFO') as logs:
+            self.client.get(reverse('todo_calendar_api'))
+        entry = logs.records[0].access
+        self.assertEqual(entry['view'], 'todo_calendar_api')
+        self.assertEqual(entry['user_id'], self.user.pk)
+        self.assertEqual(entry['status'], 200)
+        self.assertGreaterEqual(entry['queries'], 1)
+        self.assertFalse(entry['slow'])
+        self.assertNotIn('slow_queries', entry)
+
+    @override_settings(TODOS_ACCESS_LOG_SAMPLE_RATE=0, TODOS_SLOW_REQUEST_MS=10000)
+    def test_unsampled_request_not_logged(self):
+        """Test that a sample rate of 0 logs nothing for fast requests"""
+        with self.assertNoLogs('todos.access', 'INFO'):
+            self.client.get(reverse('todo_calendar_api'))
+
+    @override_settings(TODOS_ACCESS_LOG_SAMPLE_RATE=0, TODOS_SLOW_REQUEST_MS=0, TODOS_SLOW_QUERY_MS=0)
+    def test_slow_request_always_logged_with_sql(self):
+        """Test that slow requests bypass sampling and carry the slow SQL of todos views"""
+        with self.assertLogs('todos.access', 'INFO') as logs:
+            self.client.get(reverse('todo_calendar_api'))
+        entry = logs.records[0].access
+        self.assertTrue(entry['slow'])
+        self.assertTrue(any('todos_todo' in query['sql'] for query in entry['slow_queries']))
+
+    def test_background_handler_writes_json(self):
+        """Test that the background handler formats and writes records off-thread"""
+        stream = StringIO()
+        handler = BackgroundHandler(stream=stream)
+        handler.setFormatter(JsonFormatter())
+        record = logging.LogRecord('todos.access', logging.INFO, __file__, 1, 'GET /', None, None)
+        record.access = {'path': '/', 'status': 200}
+        handler.handle(record)
+        handler.close()
+
+        data = json.loads(stream.getvalue())
+        self.assertEqual(data['path'], '/')
+        self.assertEqual(data['status'], 200)
+        self.assertEqual(data['logger'], 'todos.access')
+
+    def test_background_handler_built_by_dict_config(self):
+        """Test that dictConfig builds the handler from the LOGGING entry"""
+        config = copy.deepcopy({'version': 1, 'handlers': {'access': settings.LOGGING['handlers']['access']}})
+        configurator = logging.config.DictConfigurator(config)
+        configurator.config['formatters'] = {'json': JsonFormatter()}
+        handler = configurator.configure_handler(configurator.config['handlers']['access'])
+        self.addCleanup(handler.close)
+        self.assertIsInstance(handler, BackgroundHandler)
+        self.assertIsInstance(handler.target.formatter, JsonFormatter)
+
+    def test_background_handler_started_once_across_threads(self):
+        """Test that concurrent first records share one queue and listener"""
+        stream = StringIO()
+        handler = BackgroundHandler(stream=stream)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        barrier = threading.Barrier(8)
+        queues = []
+
+        def emit(n):
+            barrier.wait()
+            handler.emit(logging.LogRecord('todos.access', logging.INFO, __file__, 1, str(n), None, None))
+            queues.append(handler.queue)
+
+        threads = [threading.Thread(target=emit, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        handler.close()
+
+        self.assertEqual(len({id(q) for q in queues}), 1)
+        self.assertEqual(sorted(stream.getvalue().split()), [str(n) for n in range(8)])
+
+
+class EnvChoiceTest(TestCase):
+    """Test validation of profile environment variables"""
+
+    def test_unknown_choice_rejected(self):
+        """Test that a mistyped profile lists the valid choices"""
+        os.environ['TODO_TEST_PROFILE'] = 'cache_db'
+        self.addCleanup(os.environ.pop, 'TODO_TEST_PROFILE')
+        with self.assertRaisesMessage(ImproperlyConfigured, 'choose one of: db, cached_db'):
+            env_choice('TODO_TEST_PROFILE', ['db', 'cached_db'], 'db')
+
+    def test_default_used_when_unset(self):
+        """Test that the default applies without the environment variable"""
+        self.assertEqual(env_choice('TODO_TEST_PROFILE', ['db', 'cached_db'], 'cached_db'), 'cached_db')
+
+
+class SessionCacheTest(TestCase):
+    """Test that cached_db sessions are only offered with a shared cache"""
+
+    def make_store(self, location, session_key=None):
+        # Each store gets its own cache connection, as in separate processes;
+        # LocMemCache instances with the same location share their entries.
+        store = cached_db.SessionStore(session_key)
+        store._cache = LocMemCache(location, {})
+        return store
+
+    def test_flushed_session_rejected_through_shared_cache(self):
+        """Test that a session flushed in one store is gone for a store sharing the cache"""
+        first = self.make_store('shared-sessions')
+        first['user'] = 'testuser'
+        first.save()
+        second = self.make_store('shared-sessions', first.session_key)
+        self.assertEqual(second.load(), {'user': 'testuser'})
+        first.flush()
+        self.assertEqual(second.load(), {})
+
+    def test_flushed_session_survives_in_process_local_cache(self):
+        """Test that a store with its own process-local cache keeps serving a flushed session"""
+        first = self.make_store('worker-1-sessions')
+        first['user'] = 'testuser'
+        first.save()
+        second = self.make_store('worker-2-sessions', first.session_key)
+        second.load()
+        first.flush()
+        self.assertEqual(second.load(), {'user': 'testuser'})
+
+    def test_process_local_session_cache_rejected(self):
+        """Test that cached_db refuses a LocMem session cache"""
+        with self.assertRaisesMessage(ImproperlyConfigured, 'not shared between processes'):
+            require_shared_cache(settings.CACHES, 'default')
+
+    def test_session_cache_url(self):
+        """Test that TODO_SESSION_CACHE_URL builds a shared cache"""
+        caches = {'sessions': cache_from_url('TODO_SESSION_CACHE_URL', 'redis://cache:6379/1')}
+        self.assertEqual(caches['sessions']['LOCATION'], 'redis://cache:6379/1')
+        require_shared_cache(caches, 'sessions')
+        self.assertEqual(cache_from_url('TODO_SESSION_CACHE_URL', 'memcached://cache:11211')['LOCATION'], 'cache:11211')
+        with self.assertRaisesMessage(ImproperlyConfigured, 'use one of: redis, rediss, memcached'):
+            cache_from_url('TODO_SESSION_CACHE_URL', 'locmem://')
@@ -0,0 +1,115 @@
+"""
+Per-user rate limiting and request coalescing for hot read endpoints.
+
+``TokenBucket`` keeps one bucket per key in process memory, so with several
+worker processes each of them allows the configured rate. ``SingleFlight``
+lets concurrent identical requests share the work of the first one instead
+of each running the same queries.
+"""
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.translation import gettext as _
+
+MAX_BUCKETS = 10000
+
+
+class TokenBucket:
+    """
+    Token buckets refilled at ``rate`` tokens per second and holding at most
+    ``burst`` tokens, one per key. ``rate`` and ``burst`` are read from
+    settings on every call so they can be changed at runtime.
+    """
+
+    def __init__(self, rate_setting, burst_setting):
+        self.rate_setting = rate_setting
+        self.burst_setting = burst_setting
+        self.lock = threading.Lock()
+        self.buckets = {}  # key -> (tokens, last refill)
+
+    def take(self, key):
+        """Take a token for ``key``; return 0 if allowed, else seconds until one is available."""
+        rate = getattr(settings, self.rate_setting, 0)
+        burst = getattr(settings, self.burst_setting, 0)
+        if not rate or not burst:
+            return 0
+
+        now = time.monotonic()
+        with self.lock:
+            tokens, last = self.buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - last) * rate)
+            if tokens < 1:
+                self.buckets[key] = (tokens, now)
+                return (1 - tokens) / rate
+            if key not in self.buckets and len(self.buckets) >= MAX_BUCKETS:
+                # Full buckets carry no state worth keeping.
+                self.buckets = {k: v for k, v in self.buckets.items() if v[0] + (now - v[1]) * rate < burst}
+            self.buckets[key] = (tokens - 1, now)
+            return 0
+
+    def reset(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class SingleFlight:
+    """
+    Run ``func`` once per key at a time: callers arriving while a call for
+    the same key is in flight wait for it and get its result (or exception).
+    Nothing is kept once the call finishes.
+    """
+
+    class Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, func):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = self.Call()
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = func()
+            except BaseException as exc:
+                call.error = exc
+            finally:
+                with self.lock:
+                    del self.calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+
+calendar_api_bucket = TokenBucket('TODOS_CALENDAR_API_RATE', 'TODOS_CALENDAR_API_BURST')
+calendar_api_flight = SingleFlight()
+
+
+def rate_limit(bucket):
+    """View decorator answering 429 with Retry-After once the user's bucket is empty."""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            wait = bucket.take(request.user.pk)
+            if wait:
+                response = HttpResponse(_('Too many requests.'), status=429, content_type='text/plain')
+                response['Retry-After'] = str(int(wait) + 1)
+                return response
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
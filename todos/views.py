@@ -5,11 +5,47 @@ from django.contrib.auth.views import LoginView, LogoutView
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.urls import reverse_lazy
-from django.http import HttpResponseRedirect, JsonResponse
+from datetime import date, timedelta
+from functools import wraps
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch, Q
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, HttpResponseRedirect, JsonResponse
 from django.utils import timezone
 from django.utils.translation import gettext as _
-from .models import Todo
+from .models import ArchivedTodo, OccurrenceCompletion, Todo, TodoRecurrence
 from .forms import TodoForm, UserRegistrationForm
+from .throttling import calendar_api_bucket, calendar_api_flight, rate_limit
+
+# Window used for recurring TODOs when the calendar API is called without
+# FullCalendar's start/end parameters.
+DEFAULT_CALENDAR_DAYS = 42
+# Widest window the calendar API expands (FullCalendar's year views need ~1 year).
+MAX_CALENDAR_DAYS = 400
+
+
+def api_login_required(view_func):
+    """
+    Like ``login_required`` for JSON endpoints: anonymous calls get a 401
+    instead of a redirect to the login page, which API workers don't serve.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'detail': _('Authentication required.')}, status=401)
+        return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+def upcoming_completions(today):
+    """Prefetch the completions ``TodoRecurrence.next_open_occurrence(today)`` looks at."""
+    return Prefetch('recurrence__completions', queryset=OccurrenceCompletion.objects.filter(date__gte=today))
+
+
+def include_archived(request):
+    """Whether the request asked for archived TODOs too (``?archived=1``)."""
+    return request.GET.get('archived') == '1'
 
 
 class TodoListView(LoginRequiredMixin, ListView):
@@ -18,11 +54,20 @@ class TodoListView(LoginRequiredMixin, ListView):
     context_object_name = 'todos'
 
     def get_queryset(self):
-        return Todo.objects.filter(user=self.request.user)
+        return Todo.objects.filter(user=self.request.user).select_related('recurrence').prefetch_related(
+            upcoming_completions(timezone.now().date()),
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['today'] = timezone.now().date()
+        for todo in context['todos']:
+            if hasattr(todo, 'recurrence'):
+                # What the list checkbox completes (see toggle_todo).
+                todo.next_occurrence = todo.recurrence.next_open_occurrence(context['today'])
+        context['include_archived'] = include_archived(self.request)
+        if context['include_archived']:
+            context['archived_todos'] = ArchivedTodo.objects.filter(user=self.request.user)
         return context
 
 
@@ -43,6 +88,10 @@ class TodoUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     template_name = 'todo_form.html'
     success_url = reverse_lazy('todo_list')
 
+    def get_queryset(self):
+        # TodoForm reads the recurrence for its initial 'repeat' value.
+        return Todo.objects.select_related('recurrence')
+
     def test_func(self):
         todo = self.get_object()
         return todo.user == self.request.user
@@ -59,12 +108,37 @@ class TodoDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
 
 @login_required
 def toggle_todo(request, pk):
-    todo = get_object_or_404(Todo, pk=pk, user=request.user)
-    todo.is_completed = not todo.is_completed
-    todo.save()
+    today = timezone.now().date()
+    todos = Todo.objects.select_related('recurrence').prefetch_related(upcoming_completions(today))
+    todo = get_object_or_404(todos, pk=pk, user=request.user)
+    occurrence = request.POST.get('date')
+    if not occurrence and hasattr(todo, 'recurrence') and not todo.is_completed:
+        # The list's checkbox on a recurring TODO completes its next open
+        # occurrence; the whole series is only completed once the rule ends.
+        next_occurrence = todo.recurrence.next_open_occurrence(today)
+        occurrence = next_occurrence and next_occurrence.isoformat()
+    if occurrence:
+        toggle_occurrence(todo, occurrence)
+    else:
+        todo.is_completed = not todo.is_completed
+        todo.save()
     return redirect('todo_list')
 
 
+def toggle_occurrence(todo, occurrence):
+    """Mark one occurrence of a recurring TODO done, or undo it."""
+    recurrence = get_object_or_404(TodoRecurrence, todo=todo)
+    try:
+        day = date.fromisoformat(occurrence)
+    except ValueError:
+        raise Http404
+    if day == date.max or day not in recurrence.occurrences(day, day + timedelta(days=1)):
+        raise Http404
+    deleted, _rows = OccurrenceCompletion.objects.filter(recurrence=recurrence, date=day).delete()
+    if not deleted:
+        OccurrenceCompletion.objects.create(recurrence=recurrence, date=day)
+
+
 def register(request):
     if request.user.is_authenticated:
         return redirect('todo_list')
@@ -94,32 +168,115 @@ class TodoCalendarView(LoginRequiredMixin, ListView):
     def get_queryset(self):
         return Todo.objects.filter(user=self.request.user)
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['include_archived'] = include_archived(self.request)
+        return context
 
-@login_required
-def todo_calendar_api(request):
-    """API endpoint for FullCalendar to fetch events"""
-    todos = Todo.objects.filter(user=request.user)
-    events = []
 
-    for todo in todos:
-        # Determine event color based on status
-        if todo.is_completed:
-            color = '#10B981'  # Green for completed
-        elif todo.due_date and todo.due_date < timezone.now().date():
-            color = '#EF4444'  # Red for overdue
-        else:
-            color = '#4F46E5'  # Indigo for active
-
-        event = {
-            'id': todo.pk,
-            'title': todo.title,
-            'start': todo.due_date.isoformat() if todo.due_date else timezone.now().date().isoformat(),
-            'color': color,
-            'extendedProps': {
-                'description': todo.description,
-                'is_completed': todo.is_completed,
-            }
+def parse_calendar_window(request):
+    """
+    Return the (start, end) dates of FullCalendar's ``start``/``end`` query
+    parameters (end exclusive), or None when they are absent.
+    """
+    start, end = request.GET.get('start'), request.GET.get('end')
+    if not start or not end:
+        return None
+    # FullCalendar sends ISO 8601 datetimes; only the date part matters here.
+    start, end = date.fromisoformat(start[:10]), date.fromisoformat(end[:10])
+    if end <= start:
+        raise ValueError('end must be after start')
+    return start, end
+
+
+def calendar_event(todo, day, is_completed, today, **extra_props):
+    # Determine event color based on status
+    if is_completed:
+        color = '#10B981'  # Green for completed
+    elif day < today:
+        color = '#EF4444'  # Red for overdue
+    else:
+        color = '#4F46E5'  # Indigo for active
+
+    return {
+        'id': todo.pk,
+        'title': todo.title,
+        'start': day.isoformat(),
+        'color': color,
+        'extendedProps': {
+            'description': todo.description,
+            'is_completed': is_completed,
+            **extra_props,
         }
-        events.append(event)
+    }
+
+
+def calendar_events(user, window, filter_window, with_archived, today):
+    """FullCalendar events for ``user``'s TODOs in ``window`` (end exclusive)."""
+    todos = Todo.objects.filter(user=user).select_related('recurrence')
+    if filter_window:
+        todos = todos.filter(
+            Q(recurrence__isnull=False)
+            | Q(due_date__isnull=True)
+            | Q(due_date__gte=window[0], due_date__lt=window[1])
+        )
+
+    events = []
+    recurring = []
+    for todo in todos:
+        if hasattr(todo, 'recurrence'):
+            recurring.append(todo)
+            continue
+        events.append(calendar_event(todo, todo.due_date or today, todo.is_completed, today))
+
+    if recurring:
+        # Completions are sparse: one query for the whole window.
+        completed = set(OccurrenceCompletion.objects.filter(
+            recurrence__in=[todo.recurrence for todo in recurring], date__gte=window[0], date__lt=window[1],
+        ).values_list('recurrence_id', 'date'))
+        for todo in recurring:
+            rule = todo.recurrence
+            for day in rule.occurrences(*window):
+                is_completed = todo.is_completed or (rule.pk, day) in completed
+                events.append(calendar_event(
+                    todo, day, is_completed, today, occurrence=day.isoformat(), rrule=rule.rrule,
+                ))
+
+    if with_archived:
+        archived = ArchivedTodo.objects.filter(user=user)
+        if filter_window:
+            # Without a due date an archived TODO is shown on its last update.
+            archived = archived.filter(
+                Q(due_date__gte=window[0], due_date__lt=window[1])
+                | Q(due_date__isnull=True, updated_at__date__gte=window[0], updated_at__date__lt=window[1])
+            )
+        for todo in archived:
+            event = calendar_event(todo, todo.due_date or timezone.localdate(todo.updated_at), True, today, archived=True)
+            event['id'] = f'archived-{todo.pk}'
+            events.append(event)
+
+    return events
+
+
+@api_login_required
+@rate_limit(calendar_api_bucket)
+def todo_calendar_api(request):
+    """API endpoint for FullCalendar to fetch events"""
+    try:
+        requested_window = parse_calendar_window(request)
+    except ValueError:
+        return HttpResponseBadRequest(_('Invalid start or end date.'))
+    if requested_window and (requested_window[1] - requested_window[0]).days > MAX_CALENDAR_DAYS:
+        return HttpResponseBadRequest(_('The requested date range is too long.'))
 
-    return JsonResponse(events, safe=False)
+    today = timezone.now().date()
+    window = requested_window or (
+        today.replace(day=1), today.replace(day=1) + timedelta(days=DEFAULT_CALENDAR_DAYS)
+    )
+    args = (window, requested_window is not None, include_archived(request), today)
+    # Several open tabs re-fetch the same view at once: identical requests
+    # in flight share one set of queries and one serialized payload.
+    content = calendar_api_flight.do((request.user.pk, *args), lambda: json.dumps(
+        calendar_events(request.user, *args), cls=DjangoJSONEncoder,
+    ))
+    return HttpResponse(content, content_type='application/json')